@@ -0,0 +1,241 @@
+"""
+Benchmarks of the parts of the program whose cost depends on the number of shows.
+Every benchmark runs in a temporary directory, so the saved shows are left untouched.
+
+Usage: python benchmarks.py [name of benchmark ...]
+Runs every benchmark if no name is given.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import default_values as val
+from classes import Show, ShowsFileHandler, parse_release_string
+
+sizes = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+class BenchmarkSettings:
+    """
+    The settings used by ShowsFileHandler during benchmarks. Stands in for classes.Settings, which requires the GUI.
+    """
+    release_grace_period = val.release_grace_period
+    send_notifications = False
+    weight_to_add = val.weight_to_add
+    move_recently_released_to_top = val.move_recently_released_to_top
+    sort_by_upcoming = val.sort_by_upcoming
+
+
+def make_shows(num_of_shows: int) -> ShowsFileHandler:
+    """
+    Returns a ShowsFileHandler holding num_of_shows generated shows. Nothing is saved.
+    Must be called from within a temporary directory.
+    """
+    val.use_show_snapshot = False
+    val.save_in_background = False
+    shows = ShowsFileHandler(BenchmarkSettings())
+    for n in range(num_of_shows):
+        shows.append(Show(num_id=n, title=f"Show {n}", weight=n % 10, color=n % 4,
+                          release_string=random.choice(("", "Monday 20:20", "fri 6:00", ".24 /12 10:10"))))
+    return shows
+
+
+def timed(function, repeats: int) -> float:
+    """
+    Returns the average time of calling function in nanoseconds.
+    """
+    start = time.perf_counter_ns()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter_ns() - start) / repeats
+
+
+def benchmark_id_lookup():
+    """
+    The time it takes to find a show from its id and to hand out a new id.
+    """
+    print(f"{'shows':>10} {'from_id (ns)':>14} {'new_id (ns)':>14}")
+    for size in sizes:
+        shows = make_shows(size)
+        ids = [random.randrange(size) for _ in range(10_000)]
+        lookups = iter(ids)
+        lookup_time = timed(lambda: shows.from_id(next(lookups)), len(ids))
+        shows.new_id()  # The first call computes the next id from every show
+        new_id_time = timed(shows.new_id, 10_000)
+        print(f"{size:>10} {lookup_time:>14.0f} {new_id_time:>14.0f}")
+
+
+def benchmark_show_memory():
+    """
+    The memory used per show, both before and after links and release info have been decoded.
+    """
+    release_strings = ("", "Monday 20:20", "fri 6:00", ".24 /12 10:10")
+    print(f"{'shows':>10} {'lazy (bytes/show)':>18} {'hydrated (bytes/show)':>22}")
+    for size in sizes[2:]:
+        results = []
+        for lazy in (True, False):
+            tracemalloc.start()
+            created = [Show.from_row([str(n), f"Show {n}", str(n % 20), "1", f"https://example.com/{n}", str(n % 10),
+                                      str(n % 4), "True", release_strings[n % 4], "0.0", "False", "False"], lazy=lazy)
+                       for n in range(size)]
+            results.append(tracemalloc.get_traced_memory()[0] / len(created))
+            tracemalloc.stop()
+            del created
+        print(f"{size:>10} {results[0]:>18.0f} {results[1]:>22.0f}")
+
+
+def benchmark_bulk_operations():
+    """
+    The time it takes to count and change many shows at once, with and without the columnar store.
+    """
+    print(f"{'shows':>10} {'store':>9} {'count_where (ms)':>17} {'count_visible (ms)':>19} {'recolor (ms)':>13}")
+    for size in sizes[1:4]:
+        for columnar in (False, True):
+            val.columnar_show_store = columnar
+            shows = make_shows(size)
+            count_time = timed(lambda: shows.count_where(color=1, weight=3), 10) / 1e6
+            visible_time = timed(lambda: shows.columns.count_visible() if columnar else
+                                 sum(not show.is_hidden or show.is_recently_released for show in shows), 10) / 1e6
+            recolor_time = timed(lambda: shows.recolor(2, color=1) + shows.recolor(1, color=2), 10) / 1e6
+            print(f"{size:>10} {'columnar' if columnar else 'objects':>9} {count_time:>17.2f} {visible_time:>19.2f}"
+                  f" {recolor_time:>13.2f}")
+    val.columnar_show_store = False
+
+
+def benchmark_release_check():
+    """
+    The time it takes to work out which shows are recently released, one show at a time and all at once.
+    """
+    print(f"{'shows':>10} {'check_release (ms)':>19} {'batch (ms)':>11} {'batch, columnar (ms)':>21}")
+    for size in sizes[1:4]:
+        results = []
+        for columnar in (False, True):
+            val.columnar_show_store = columnar
+            shows = make_shows(size)
+            for n, show in enumerate(shows):
+                show.last_dismissal = time.time() - n % 500 * 3600 if n % 3 else 0
+            if not columnar:
+                results.append(timed(lambda: [show.check_release(val.release_grace_period) for show in shows], 3))
+            results.append(timed(shows.recently_released_statuses, 3))
+        val.columnar_show_store = False
+        print(f"{size:>10} {results[0] / 1e6:>19.1f} {results[1] / 1e6:>11.1f} {results[2] / 1e6:>21.1f}")
+
+
+def benchmark_release_scheduler():
+    """
+    The time a periodic release update takes, checking every show or only the shows that are due.
+    """
+    print(f"{'shows':>10} {'check_all_releases (ms)':>24} {'update_releases (ms)':>21}")
+    for size in sizes[1:4]:
+        shows = make_shows(size)
+        shows.check_all_releases()
+        full_time = timed(shows.check_all_releases, 3) / 1e6
+        update_time = timed(shows.update_releases, 100) / 1e6
+        print(f"{size:>10} {full_time:>24.2f} {update_time:>21.3f}")
+
+
+def benchmark_release_parsing():
+    """
+    The time it takes to parse the release strings of many shows, with and without the cache of parsed strings.
+    The release strings are drawn from a corpus that resembles those of real shows, where many strings are shared.
+    """
+    weekdays = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday", "mon", "fri", "sun")
+    corpus = [f"{random.choice(weekdays)} {random.randrange(24)}:{random.choice((0, 0, 15, 30, 45)):02d}"
+              for _ in range(400)]
+    corpus += [f".{random.randrange(1, 29)} {random.randrange(24)}:00" for _ in range(50)]
+    corpus += [f"<2026 /{random.randrange(1, 13)} .{random.randrange(1, 29)} 20:00" for _ in range(50)]
+    print(f"{'shows':>10} {'uncached (ms)':>14} {'cached (ms)':>12}")
+    for size in sizes[1:4]:
+        release_strings = [random.choice(corpus) for _ in range(size)]
+        uncached_time = timed(lambda: [parse_release_string.__wrapped__(string) for string in release_strings], 3)
+        parse_release_string.cache_clear()
+        cached_time = timed(lambda: [parse_release_string(string) for string in release_strings], 3)
+        print(f"{size:>10} {uncached_time / 1e6:>14.2f} {cached_time / 1e6:>12.2f}")
+
+
+def legacy_sort_keys(weight_to_add: int, now):
+    """
+    Returns the main_key and upcoming_key that do_sorting used to sort with, for comparison.
+    """
+    def get_sorting_weight(show: Show) -> int:
+        if show.is_recently_released:
+            return -show.weight - weight_to_add
+        return -show.weight
+
+    def main_key(show: Show):
+        return get_sorting_weight(show), show.title
+
+    def upcoming_key(show: Show):
+        if show.was_dismissed(now):
+            secondary = show.hours_to_release(now)
+        else:
+            secondary = -show.hours_since_last_dismissal(now)
+        if show.is_recently_released:
+            return get_sorting_weight(show), 0, secondary if secondary != 0.0 else 99999999, show.title
+        return get_sorting_weight(show), 1 if secondary > 0 else 2, secondary, show.title
+
+    return main_key, upcoming_key
+
+
+def benchmark_sort_keys():
+    """
+    The time it takes to sort every show from a shuffled order, with the key functions do_sorting used to sort with and
+    with the keys of ShowOrder, all of which are made anew. The titles have already been ranked, as they are after the
+    first sort.
+    """
+    def timed_from_shuffled(function, repeats: int) -> float:
+        total = 0
+        for _ in range(repeats):
+            random.shuffle(shows.shows)
+            total += timed(function, 1)
+        return total / repeats
+
+    print(f"{'shows':>10} {'main_key (ms)':>14} {'keys (ms)':>10} {'upcoming_key (ms)':>18} {'keys (ms)':>10}")
+    for size in sizes[2:4]:
+        shows = make_shows(size)
+        for n, show in enumerate(shows):
+            show.last_dismissal = time.time() - n % 500 * 3600 if n % 3 else 0
+        shows.check_all_releases()
+        now = shows.clock.now()
+        main_key, upcoming_key = legacy_sort_keys(0, now)
+        results = []
+        for key, sort_by_upcoming in ((main_key, False), (upcoming_key, True)):
+            shows.do_sorting(0, sort_by_upcoming, now)
+            results.append(timed_from_shuffled(lambda: sorted(shows.shows, key=key), 3) / 1e6)
+            results.append(timed_from_shuffled(lambda: (shows.order.clear(), shows.do_sorting(0, sort_by_upcoming, now)),
+                                               3) / 1e6)
+        print(f"{size:>10} {results[0]:>14.1f} {results[1]:>10.1f} {results[2]:>18.1f} {results[3]:>10.1f}")
+
+
+def benchmark_sorting():
+    """
+    The time do_sorting takes when every show is sorted, when a single show has changed and when nothing has changed.
+    """
+    print(f"{'shows':>10} {'everything (ms)':>16} {'one show (ms)':>14} {'nothing (ms)':>13}")
+    for size in sizes[1:4]:
+        shows = make_shows(size)
+        shows.check_all_releases()
+        full_time = timed(lambda: (shows.order.clear(), shows.do_sorting(sort_by_upcoming=True)), 3) / 1e6
+
+        def change_one_show():
+            random.choice(shows.shows).weight += 1
+            shows.do_sorting(sort_by_upcoming=True)
+        one_time = timed(change_one_show, 100) / 1e6
+        nothing_time = timed(lambda: shows.do_sorting(sort_by_upcoming=True), 100) / 1e6
+        print(f"{size:>10} {full_time:>16.2f} {one_time:>14.3f} {nothing_time:>13.3f}")
+
+
+benchmarks = {"id_lookup": benchmark_id_lookup, "show_memory": benchmark_show_memory,
+              "bulk_operations": benchmark_bulk_operations, "release_check": benchmark_release_check,
+              "release_scheduler": benchmark_release_scheduler, "release_parsing": benchmark_release_parsing,
+              "sort_keys": benchmark_sort_keys, "sorting": benchmark_sorting}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(benchmarks)
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        for name in names:
+            print(f"--- {name} ---")
+            benchmarks[name]()
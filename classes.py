@@ -5,8 +5,17 @@ import webbrowser
 import datetime
 import time
 import datetime
+import json
+import sys
+import heapq
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from notifypy import Notify
 import default_values as val
+from columns import ShowColumns, column_types, release_columns
+from storage import make_store, diff_rows, RowChanges, ShowsWriter, BackupManager, snapshot_key, read_snapshot, \
+    write_snapshot, COL_EP
 
 
 weekday_to_int = {"mon": 0,
@@ -20,7 +29,11 @@ weekday_to_int = {"mon": 0,
 
 link_seperator = "<NEXT_LINK>"
 
+# A time of day in a release string, such as 20:05
+_time_of_day = re.compile(r"(\d+):(\d+)")
 
+
+@lru_cache(maxsize=val.release_parse_cache_size)
 def parse_release_string(release_string) -> Union[tuple[int, int, int], tuple[tuple[int, int, int], int, int], bool]:
     """
     Parses release_string. Note that weekday is converted to an integer, where monday is 0 and sunday is 6.
@@ -43,6 +56,11 @@ def parse_release_string(release_string) -> Union[tuple[int, int, int], tuple[tu
 
     Both weekday and date cannot be used at the same time. Weekday is prioritised.
     If date is used, then the first item in the return tuple will be a tuple of (day, month, year)
+    A time of day past the end of the day is carried over into the following days, so 'Monday 24:30' is returned as
+    tuesday 00:30. Release strings like these were made by older versions of the release picker.
+    Otherwise, False is returned if a value is out of range, such as the month 13 or the hour 25 of a date.
+
+    Many shows share the same release string, so the results are cached and shared. See val.release_parse_cache_size
 
     :return: A tuple of the release info. (weekday: int, hour: int, minute: int) or False
     """
@@ -57,7 +75,10 @@ def parse_release_string(release_string) -> Union[tuple[int, int, int], tuple[tu
         for part in space_split:
             if part:
                 if part[0].isdigit():  # For time of day
-                    hour, minute = (int(num) for num in part.split(":"))
+                    time_of_day = _time_of_day.fullmatch(part)
+                    if time_of_day is None:
+                        return False
+                    hour, minute = int(time_of_day[1]), int(time_of_day[2])
                 elif part[0].isalpha():  # For weekday
                     weekday = weekday_to_int[part[:3]]
                 else:  # for day, month and year.
@@ -83,7 +104,13 @@ def parse_release_string(release_string) -> Union[tuple[int, int, int], tuple[tu
             minute = 0
 
         if weekday != 7 or not date_month_year_is_defined:
-            return weekday, hour, minute
+            days, minutes = divmod(hour * 60 + minute, 24 * 60)
+            if weekday != 7:
+                weekday = (weekday + days) % 7
+            return weekday, minutes // 60, minutes % 60
+
+        if not (hour < 24 and minute < 60 and 0 <= day <= 31 and 0 <= month <= 12 and 0 <= year <= datetime.MAXYEAR):
+            return False
         return (day, month, year), hour, minute
     except (IndexError, KeyError, TypeError, ValueError):  # I don't know which Errors might appear,
         return False  # and it doesn't really matter. It should just return False if release_string can't be parsed.
@@ -296,13 +323,64 @@ def hours_since_two_datetime_weekly(past_date: datetime.datetime, future_date: d
     return hours_since_weekly(weekday, past_date.hour, past_date.minute, future_date)
 
 
+class Clock:
+    """
+    Tells the current time. The time is read once per refresh and handed on to every check, so that all shows are
+    checked against the same point in time. A clock can also be set to stand still at a given time, which lets tests
+    and simulations decide what the time is.
+    """
+
+    def __init__(self, fixed: Union[datetime.datetime, None] = None):
+        self.fixed = fixed  # The time the clock stands still at. None if it follows the system time
+
+    def now(self) -> datetime.datetime:
+        """
+        Returns the current time
+        """
+        if self.fixed is not None:
+            return self.fixed
+        return datetime.datetime.now()
+
+    def set(self, fixed: Union[datetime.datetime, None]):
+        """
+        Makes the clock stand still at fixed. If fixed is None, the clock follows the system time again.
+        """
+        self.fixed = fixed
+
+    def advance(self, hours: float):
+        """
+        Moves the clock forward and makes it stand still there.
+        """
+        self.fixed = self.now() + datetime.timedelta(hours=hours)
+
+
+# Local time as whole seconds from 1970-01-01 00:00. See local_seconds
+_epoch_ordinal = datetime.date(1970, 1, 1).toordinal()
+# The range of local seconds for which the cached release times of a date that has both a month and a year stay valid
+_forever = (-2 ** 63, 2 ** 63 - 1)
+
+
+@lru_cache(maxsize=1)
+def local_seconds(moment: datetime.datetime) -> int:
+    """
+    Returns the number of whole seconds from 1970-01-01 00:00 till moment. Like the rest of the release arithmetic,
+    this is done in local time, so daylight saving time is ignored.
+    The result for the last moment is remembered, as every show is checked against the same moment during a refresh.
+    """
+    return (moment.toordinal() - _epoch_ordinal) * 86400 + moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
 class ReleaseInfo:
     TYPE_UNDEFINED = 0
     TYPE_WEEKDAY = 1
     TYPE_DATE = 2
 
+    # Slots rather than a __dict__ per instance, as there is one ReleaseInfo per show
+    __slots__ = ("release_string", "type", "hour", "minute", "weekday", "day", "month", "year",
+                 "_previous", "_next", "_valid_from", "_valid_until")
+
     def __init__(self, release_string=""):
-        self.release_string = release_string
+        self.release_string = sys.intern(release_string)
         self.type = self.TYPE_UNDEFINED
         self.hour = 0
         self.minute = 0
@@ -312,6 +390,47 @@ class ReleaseInfo:
         self.year = 0
         self.parse()
 
+    @classmethod
+    def from_fields(cls, release_string: str, fields: tuple[int, int, int, int, int, int, int],
+                    times: Union[tuple[int, int, int, int], None] = None) -> "ReleaseInfo":
+        """
+        Creates a ReleaseInfo from values that have already been parsed, as returned by .get_fields.
+
+        :param times: The release times worked out earlier, as returned by .get_release_times
+        """
+        release_info = cls.__new__(cls)
+        release_info.release_string = sys.intern(release_string)
+        (release_info.type, release_info.weekday, release_info.day, release_info.month, release_info.year,
+         release_info.hour, release_info.minute) = fields
+        release_info.forget_release_times()
+        if times is not None:
+            release_info._previous, release_info._next, release_info._valid_from, release_info._valid_until = times
+        return release_info
+
+    def get_fields(self) -> tuple[int, int, int, int, int, int, int]:
+        """
+        Returns the parsed values as a tuple of (type, weekday, day, month, year, hour, minute)
+        """
+        return self.type, self.weekday, self.day, self.month, self.year, self.hour, self.minute
+
+    def get_release_times(self) -> Union[tuple[int, int, int, int], None]:
+        """
+        Returns the cached release times as a tuple of (previous release, next release, valid from, valid until),
+        or None if they haven't been worked out. See .compile
+        """
+        if self._previous is None:
+            return None
+        return self._previous, self._next, self._valid_from, self._valid_until
+
+    def forget_release_times(self):
+        """
+        Throws away the cached release times. They are worked out again the next time they are needed.
+        """
+        self._previous = None
+        self._next = None
+        self._valid_from = 0
+        self._valid_until = 0
+
     def reset(self):
         """
         Resets the object
@@ -324,14 +443,19 @@ class ReleaseInfo:
         self.year = 1
         self.type = self.TYPE_UNDEFINED
         self.release_string = ""
+        self.forget_release_times()
 
     def parse(self):
         """
-        Parses .release_string updating all other values.
+        Parses .release_string updating all other values. If the release string can't be parsed, the release info is
+        undefined, but the release string is kept as it is, so that it isn't lost when the show is saved.
         """
+        self.forget_release_times()
         parsed = parse_release_string(self.release_string)
         if not parsed:
+            release_string = self.release_string
             self.reset()
+            self.release_string = release_string
             return
 
         if isinstance(parsed[0], tuple):
@@ -353,41 +477,255 @@ class ReleaseInfo:
         """
         Changes the release_string and immediately parses it.
         """
-        self.release_string = new_release_string
+        self.release_string = sys.intern(new_release_string)
         self.parse()
 
-    def hours_since_release(self) -> float:
+    def compile(self, now: datetime.datetime):
         """
-        Returns the number of hours since the show was released.
+        Works out the previous and the next release as local seconds (see local_seconds), along with the range of
+        times during which they stay the same. The range ends when now reaches the next release, or at midnight for
+        releases that are - today -. Until then, the hours since and till the release are a single subtraction.
+        Nothing is cached if the release can't be worked out, such as the 31st in a month with 30 days.
+        """
+        second = local_seconds(now)
+        minute = second - now.second
+        self.forget_release_times()
+        try:
+            since = self._hours_since_release(now)
+            till = self._hours_to_release(now)
+        except ValueError:
+            till = None
+        if till is None or self.type == self.TYPE_DATE and till == 0:  # hours_till_not_weekly returns 0 on failure
+            self._valid_from, self._valid_until = minute, minute + 60
+            return
+
+        # The scalar functions ignore the seconds of now for weekdays, but not for dates
+        if self.type == self.TYPE_WEEKDAY:
+            previous, next_ = minute - round(since * 3600), minute + round(till * 3600)
+            if self.weekday == 7:
+                valid_from = minute - now.hour * 3600 - now.minute * 60
+                valid_until = valid_from + 86400
+            elif previous == minute:  # Released this minute
+                valid_from, valid_until = minute, minute + 60
+            else:
+                valid_from, valid_until = previous + 60, next_
+        else:
+            previous = second - round(since * 3600)
+            next_ = second + (now.microsecond > 0) + round(till * 3600)
+            releases_now = (self.day == now.day and self.hour == now.hour and self.minute == now.minute
+                            and self.month in (0, now.month) and self.year in (0, now.year))
+            if self.month and self.year:
+                valid_from, valid_until = _forever
+            elif releases_now or till < 0:
+                valid_from, valid_until = minute, minute + 60
+            else:
+                valid_from, valid_until = previous + 60, next_
+        self._previous, self._next, self._valid_from, self._valid_until = previous, next_, valid_from, valid_until
+
+    def _hours_since_release(self, now: datetime.datetime) -> float:
+        """
+        Works out the hours since release from scratch. See .hours_since_release
         """
         if self.type == self.TYPE_DATE:
             return hours_since_not_weekly((self.day, self.month, self.year),
-                                          self.hour, self.minute, datetime.datetime.now())
+                                          self.hour, self.minute, now)
         elif self.type == self.TYPE_WEEKDAY:
-            return hours_since_weekly(self.weekday, self.hour, self.minute, datetime.datetime.now())
+            return hours_since_weekly(self.weekday, self.hour, self.minute, now)
         return 0
 
-    def hours_since_two_releases(self) -> float:
+    def _hours_to_release(self, now: datetime.datetime) -> float:
+        """
+        Works out the hours till release from scratch. See .hours_to_release
+        """
+        if self.type == self.TYPE_DATE:
+            return hours_till_not_weekly((self.day, self.month, self.year), self.hour, self.minute, now)
+        elif self.type == self.TYPE_WEEKDAY:
+            return hours_till_weekly(self.weekday, self.hour, self.minute, now)
+
+    def hours_since_release(self, now: Union[datetime.datetime, None] = None) -> float:
+        """
+        Returns the number of hours since the show was released.
+
+        :param now: The current time. Read from the system if None
+        """
+        if now is None:
+            now = datetime.datetime.now()
+        if self.type == self.TYPE_UNDEFINED:
+            return 0
+        second = local_seconds(now)
+        if not self._valid_from <= second - now.second < self._valid_until:
+            self.compile(now)
+        if self._previous is None:
+            return self._hours_since_release(now)
+        if self.type == self.TYPE_WEEKDAY:
+            return (second - now.second - self._previous) / 3600
+        return (second - self._previous) / 3600
+
+    def hours_since_two_releases(self, now: Union[datetime.datetime, None] = None) -> float:
         """
         Returns the number of hours since the second-last release. Returns 0 if there has only been one release.
+
+        :param now: The current time. Read from the system if None
         """
         if self.type == self.TYPE_DATE:
             return 0
-        return self.hours_since_release() + 24*7
+        return self.hours_since_release(now) + 24*7
 
-    def hours_to_release(self) -> float:
+    def hours_to_release(self, now: Union[datetime.datetime, None] = None) -> float:
         """
         Returns the number of hours till release
+
+        :param now: The current time. Read from the system if None
         """
-        if self.type == self.TYPE_DATE:
-            return hours_till_not_weekly((self.day, self.month, self.year), self.hour, self.minute,
-                                         datetime.datetime.now())
-        elif self.type == self.TYPE_WEEKDAY:
-            return hours_till_weekly(self.weekday, self.hour, self.minute,
-                                     datetime.datetime.now())
+        if now is None:
+            now = datetime.datetime.now()
+        if self.type == self.TYPE_UNDEFINED:
+            return None
+        second = local_seconds(now)
+        if not self._valid_from <= second - now.second < self._valid_until:
+            self.compile(now)
+        if self._previous is None:
+            return self._hours_to_release(now)
+        if self.type == self.TYPE_WEEKDAY:
+            return (self._next - second + now.second) / 3600
+        return (self._next - second - (now.microsecond > 0)) / 3600
+
+
+@lru_cache(maxsize=1024)
+def _month_start(year: int, month: int) -> Union[tuple[int, int], None]:
+    """
+    Returns the ordinal of the first day of a month along with the number of days in it, or None if there is no such
+    month. See datetime.date.toordinal
+    """
+    if not (1 <= month <= 12 and datetime.MINYEAR <= year <= datetime.MAXYEAR):
+        return None
+    start = datetime.date(year, month, 1).toordinal()
+    if month == 12:
+        return start, 31
+    return start, datetime.date(year, month + 1, 1).toordinal() - start
+
+
+def release_hours_batch(now: datetime.datetime, fields: list[tuple[int, int, int, int, int, int, int]]) \
+        -> tuple[list[float], list[Union[float, None]]]:
+    """
+    Computes ReleaseInfo.hours_since_release and ReleaseInfo.hours_to_release for many release infos at once, all at
+    the same point in time. Release infos with the same fields are computed only once, and weekly and dated releases
+    are computed separately with the parts of now worked out beforehand.
+    The results are exactly those of the functions used by ReleaseInfo, given the same now. No datetime objects are
+    made, except for dates that don't exist, which are left to those very functions.
+
+    :param now: The point in time
+    :param fields: The fields of each release info, as returned by ReleaseInfo.get_fields
+    :return: A list of hours since release and a list of hours to release, both in the order of fields
+    """
+    unique = dict.fromkeys(fields)
+    weekly = [key for key in unique if key[0] == ReleaseInfo.TYPE_WEEKDAY]
+    dated = [key for key in unique if key[0] == ReleaseInfo.TYPE_DATE]
+    for key in unique:
+        unique[key] = (0, None)  # Undefined release infos
+
+    now_weekday, now_hour, now_minute = now.weekday(), now.hour, now.minute
+    now_time_of_day = now_hour * 60 + now_minute
+    for key in weekly:
+        _, weekday, _, _, _, hour, minute = key
+        time_of_day = hour * 60 + minute
+        # As in hours_since_weekly
+        if weekday == 7:
+            days_since = 0
+        elif weekday != now_weekday:
+            days_since = (now_weekday - weekday) % 7
+        else:
+            days_since = 7 if time_of_day > now_time_of_day else 0
+        # As in hours_till_weekly
+        if weekday == 7:
+            days_to = 0
+        elif weekday != now_weekday:
+            days_to = (weekday - now_weekday) % 7
+        else:
+            days_to = 7 if time_of_day < now_time_of_day else 0
+        unique[key] = (days_since * 24 + (now_hour - hour) + (now_minute - minute) / 60,
+                       days_to * 24 + hour - now_hour + (minute - now_minute) / 60)
+
+    now_day, now_month, now_year = now.day, now.month, now.year
+    now_ordinal = now.toordinal()
+    now_second = now_time_of_day * 60 + now.second
+    now_is_fractional = now.microsecond != 0
+    for key in dated:
+        _, _, day, month, year, hour, minute = key
+        time_of_day = hour * 60 + minute
+        valid_time = 0 <= hour < 24 and 0 <= minute < 60
+        later_in_month = (day, time_of_day) > (now_day, now_time_of_day)
+
+        # As in hours_since_not_weekly
+        past_month = month or (now_month - 1 if (day, time_of_day) >= (now_day, now_time_of_day) else now_month)
+        past_year = year or (now_year - 1 if (past_month, day, time_of_day) >= (now_month, now_day, now_time_of_day)
+                             else now_year)
+        month_start = _month_start(past_year, past_month)
+        if month_start is None or not valid_time or not 1 <= day <= month_start[1]:
+            since = hours_since_not_weekly((day, month, year), hour, minute, now)
+        else:
+            delta = (now_ordinal - month_start[0] - day + 1) * 86400 + now_second - time_of_day * 60
+            since = delta // 86400 * 24 + delta % 86400 / 3600
+
+        # As in hours_till_not_weekly
+        future_month = month or (now_month if later_in_month else now_month + 1)
+        future_year = year or (now_year if (future_month, day, time_of_day) > (now_month, now_day, now_time_of_day)
+                               else now_year + 1)
+        month_start = _month_start(future_year, future_month)
+        if month_start is None or not valid_time or not 1 <= day <= month_start[1] + 30:
+            to = hours_till_not_weekly((day, month, year), hour, minute, now)
+        else:
+            delta = (month_start[0] + min(day, month_start[1]) - 1 - now_ordinal) * 86400 + time_of_day * 60 \
+                    - now_second - now_is_fractional
+            to = delta // 86400 * 24 + delta % 86400 / 3600
+        unique[key] = (since, to)
+
+    results = [unique[key] for key in fields]
+    return [result[0] for result in results], [result[1] for result in results]
+
+
+def recently_released_batch(now: datetime.datetime, fields: list[tuple[int, int, int, int, int, int, int]],
+                            ended: list[bool], last_dismissals: list[float],
+                            grace_period: Union[int, float]) -> list[bool]:
+    """
+    Computes Show.check_release for many shows at once, all at the same point in time. See release_hours_batch
+
+    :param now: The point in time
+    :param fields: The fields of the release info of each show, as returned by ReleaseInfo.get_fields
+    :param ended: Whether each show has ended
+    :param last_dismissals: The last_dismissal of each show
+    :param grace_period: The amount of hours after the release that a show is still recently released
+    :return: Whether each show is recently released, in the order of fields
+    """
+    hours_since, _ = release_hours_batch(now, fields)
+    recently_released = []
+    for key, show_ended, last_dismissal, since in zip(fields, ended, last_dismissals, hours_since):
+        if show_ended or key[0] == ReleaseInfo.TYPE_UNDEFINED:
+            recently_released.append(False)
+            continue
+        if last_dismissal > 1:
+            since_dismissal = hours_since_two_datetime_not_weekly(datetime.datetime.fromtimestamp(last_dismissal), now)
+            if since_dismissal < since or since < 0:
+                recently_released.append(False)
+                continue
+        recently_released.append(since <= grace_period or grace_period == 0)
+    return recently_released
 
 
 class Show:
+    # The attributes that are written to the save file. Assigning a new value to any of these marks the show as dirty.
+    # Note that release_info and links have to be replaced, not changed in place, for this to be noticed.
+    persisted_attributes = frozenset(("id", "title", "ep", "season", "links", "weight", "color", "ep_season_relevant",
+                                      "release_info", "last_dismissal", "is_hidden", "ended"))
+
+    # Slots rather than a __dict__ per instance, which adds up with many shows. See benchmarks.benchmark_show_memory
+    __slots__ = ("id", "title", "ep", "season", "_link_string", "_links", "_release_string", "_release_info", "weight",
+                 "color", "last_dismissal", "is_hidden", "ended", "ep_season_relevant", "is_recently_released",
+                 "auto_open_link_on_release", "tracker", "dirty", "archived",
+                 # Only used by ColumnarShow. They are declared here, so that a Show can be turned into a ColumnarShow
+                 # in place. See ColumnarShow.from_show
+                 "_columns", "_row")
+
     def __init__(self,
                  num_id: Union[str, int] = -1,
                  title: str = "",
@@ -402,12 +740,20 @@ class Show:
                  is_hidden: Union[bool, str] = False,
                  ended: Union[str, bool] = False):
 
+        # These are set first, as __setattr__ relies on tracker
+        object.__setattr__(self, "tracker", None)  # The ShowsFileHandler that holds the show, if any
+        self.dirty = False  # True if a persisted attribute has changed since the show was last saved
+        self.archived = False  # True if the show is held by the archive rather than the main list. See ShowArchive
+
         self.id: int = int(num_id)
         self.title: str = title
         self.ep: int = int(ep)
         self.season: int = int(season)
-        self.links: list[str] = []
-        self.set_link_string(link_string)
+        # links and release_info are only decoded from these strings once they are first used.
+        self._link_string = link_string
+        self._links: Union[list[str], None] = None
+        self._release_string = sys.intern(release_string)  # Few distinct release strings are shared by many shows
+        self._release_info: Union[ReleaseInfo, None] = None
         self.weight: int = int(weight)
         self.color: int = int(color)
         self.last_dismissal: float = float(last_dismissal)
@@ -418,7 +764,14 @@ class Show:
 
         self.is_recently_released = False
         self.auto_open_link_on_release = False
-        self.release_info = ReleaseInfo(release_string)
+
+    def __setattr__(self, name, value):
+        if self.tracker is not None and name in self.persisted_attributes \
+                and getattr(self, name) != value:
+            object.__setattr__(self, name, value)
+            self.tracker.show_changed(self, name)
+            return
+        object.__setattr__(self, name, value)
 
     def __repr__(self):
         return f"Show(num_id={self.id}, title={self.title.__repr__()}, ep={self.ep}," \
@@ -427,10 +780,114 @@ class Show:
                f" release_info={self.release_string.__repr__()}," \
                f" last_dismissal={self.last_dismissal:.4f}, is_hidden={self.is_hidden})"
 
+    @property
+    def links(self) -> list[str]:
+        """
+        The links of the show, one per season. Decoded from the link string the first time it is used.
+        """
+        if self._links is None:
+            self._links = self._link_string.split(link_seperator)
+        return self._links
+
+    @links.setter
+    def links(self, new: list[str]):
+        self._links = new
+
+    @property
+    def release_info(self) -> ReleaseInfo:
+        """
+        The release info of the show. Parsed from the release string the first time it is used.
+        """
+        if self._release_info is None:
+            self._release_info = ReleaseInfo(self._release_string)
+        return self._release_info
+
+    @release_info.setter
+    def release_info(self, new: ReleaseInfo):
+        self._release_info = new
+
+    def is_hydrated(self) -> bool:
+        """
+        Returns True if both links and release_info have been decoded.
+        """
+        return self._links is not None and self._release_info is not None
+
+    def hydrate(self):
+        """
+        Decodes links and release_info right away, instead of waiting for them to be used.
+        """
+        _ = self.links, self.release_info
+
+    @classmethod
+    def from_row(cls, row: list[str], lazy: bool = val.lazy_show_loading, **kwargs) -> "Show":
+        """
+        Creates a show from a row laid out like the columns of the save file. Rows from older versions of the
+        program might be missing some of the last columns.
+
+        :param row: The row
+        :param lazy: If False, links and release info are decoded immediately rather than when first used
+        :param kwargs: Passed on to the constructor of cls
+        """
+        show = cls(
+            num_id=row[0],
+            title=row[1],
+            ep=row[2],
+            season=row[3],
+            link_string=row[4],
+            weight=row[5],
+            color=row[6],
+            ep_season_relevant=row[7] if len(row) > 7 else None,
+            release_string=row[8] if len(row) > 8 else "",
+            last_dismissal=row[9] if len(row) > 9 else 0,
+            is_hidden=row[10] if len(row) > 10 else None,
+            ended=row[11] if len(row) > 11 else None,
+            **kwargs
+        )
+        if not lazy:
+            show.hydrate()
+        return show
+
+    @classmethod
+    def from_snapshot_record(cls, record: tuple, **kwargs) -> "Show":
+        """
+        Creates a show from a record of a binary snapshot. See storage.write_snapshot
+        """
+        show = cls(*record[:12], **kwargs)
+        if record[12] is not None:
+            show._release_info = ReleaseInfo.from_fields(show._release_string, record[12], record[13])
+        return show
+
+    def as_snapshot_record(self) -> tuple:
+        """
+        Returns the show as a record of a binary snapshot. See storage.write_snapshot
+        """
+        return (self.id, self.title, int(self.ep), int(self.season), self.get_link_string(), self.weight, self.color,
+                self.ep_season_relevant, self.get_release_string(), self.last_dismissal, self.is_hidden, self.ended,
+                None if self._release_info is None else self._release_info.get_fields(),
+                None if self._release_info is None else self._release_info.get_release_times())
+
+    def as_row(self) -> list[str]:
+        """
+        Returns the show as a row laid out like the columns of the save file.
+        """
+        return [str(self.id), self.title, str(self.ep), str(self.season), self.get_link_string(), str(self.weight),
+                str(self.color), str(self.ep_season_relevant), self.get_release_string(),
+                str(self.last_dismissal), str(self.is_hidden), str(self.ended)]
+
+    def get_release_string(self) -> str:
+        """
+        Returns the release string of the show without parsing it, if it hasn't been parsed yet.
+        """
+        if self._release_info is None:
+            return self._release_string
+        return self._release_info.release_string
+
     def get_link_string(self):
         """
         Gets a string-representation of self.links
         """
+        if self._links is None:
+            return self._link_string
         return link_seperator.join(self.links)
 
     def set_link_string(self, new: str):
@@ -462,43 +919,54 @@ class Show:
                        default_notification_icon="GenIko.ico")
         notif.send(block=False)
 
-    def hours_to_release(self) -> float:
+    def hours_to_release(self, now: Union[datetime.datetime, None] = None) -> float:
         """
         Calculates the number of hours until this show is released.
         Moreover, the return is rounded to a number of digits. This means
         that the returned value will mostly (way, way more often than not) be equivalent between shows
         with the same release_info, assuming that the method is called at nearly the same time.
+
+        :param now: The current time. Read from the system if None
         """
-        if not self.release_info.is_defined() or self.ended:
+        if self.ended or not self.release_info.is_defined():
             return 0
-        return round(self.release_info.hours_to_release(), 3)
+        return round(self.release_info.hours_to_release(now), 3)
 
-    def hours_since_last_dismissal(self) -> float:
+    def hours_since_last_dismissal(self, now: Union[datetime.datetime, None] = None) -> float:
         """
         Returns the number of hours since last dismissal
+
+        :param now: The current time. Read from the system if None
         """
-        now = datetime.datetime.now()
+        if now is None:
+            now = datetime.datetime.now()
         return hours_since_two_datetime_not_weekly(datetime.datetime.fromtimestamp(self.last_dismissal),
                                                    now)
 
-    def was_dismissed(self) -> bool:
+    def was_dismissed(self, now: Union[datetime.datetime, None] = None) -> bool:
         """
         Determines whether the show was dismissed before another episode aired. In other
         words, has the previously aired episode been watched by the user?
+
+        :param now: The current time. Read from the system if None
         """
-        hours_since_dismissal = self.hours_since_last_dismissal()
-        hours_since_release = self.release_info.hours_since_two_releases()
+        if now is None:
+            now = datetime.datetime.now()
+        hours_since_dismissal = self.hours_since_last_dismissal(now)
+        hours_since_release = self.release_info.hours_since_two_releases(now)
         return hours_since_dismissal < hours_since_release
 
-    def string_time_till_release(self, precise_time_left=False) -> str:
+    def string_time_till_release(self, precise_time_left=False, now: Union[datetime.datetime, None] = None) -> str:
         """
         Returns a string of the amount of time till release. This string is suffixed by a unit (i.e. m, h etc.)
         Note that the length of this string will not (and should not) exceed 3 characters unless the time till release is in
         100 years or more.
+
+        :param now: The current time. Read from the system if None
         """
-        if not self.release_info.is_defined() or self.is_recently_released or self.ended:
+        if self.ended or self.is_recently_released or not self.release_info.is_defined():
             return ""
-        to_release = self.hours_to_release()
+        to_release = self.hours_to_release(now)
         if not precise_time_left:
             if to_release <= 1:
                 return f"{int(to_release * 60 + 0.5)}m"
@@ -519,24 +987,27 @@ class Show:
             return f"{int(to_release / 168 + 0.5)}w"
         return f"{int(to_release / 8760 + 0.5)}y"
 
-    def check_release(self, grace_period: Union[int, float]) -> bool:
+    def check_release(self, grace_period: Union[int, float], now: Union[datetime.datetime, None] = None) -> bool:
         """
         Returns True if a show was released within - grace_period - hours. grace_period is ignored, if it is 0
         NOTE: Also returns False if release_info cannot be parsed, the show has been dismissed AFTER the last release
         or if the show has yet to ever be released (In the case of non-repeating releases).
 
         :param grace_period: The amount of hours after the release that the function should continue to return True
+        :param now: The current time. Read from the system if None
         :return: Whether show was released within grace_period.
         """
 
-        if not self.release_info.is_defined() or self.ended:
+        if self.ended or not self.release_info.is_defined():
             self.is_recently_released = False
             return self.is_recently_released
 
-        hours_since_release = self.release_info.hours_since_release()
+        if now is None:
+            now = datetime.datetime.now()
+        hours_since_release = self.release_info.hours_since_release(now)
 
         if self.last_dismissal > 1:
-            hours_since_dismissal = self.hours_since_last_dismissal()
+            hours_since_dismissal = self.hours_since_last_dismissal(now)
             if hours_since_dismissal < hours_since_release or hours_since_release < 0:
                 self.is_recently_released = False
                 return self.is_recently_released
@@ -545,6 +1016,762 @@ class Show:
         return self.is_recently_released
 
 
+def column_property(name: str) -> property:
+    """
+    Returns a property for ColumnarShow that keeps the attribute name of Show in a column while the show is attached,
+    and in the slot of Show otherwise.
+    """
+    slot = Show.__dict__[name]
+    convert = {"q": int, "b": bool, "d": float}[column_types[name]]
+
+    def get(self):
+        if self._columns is None:
+            return slot.__get__(self)
+        value = self._columns.columns[name][self._row]
+        return bool(value) if convert is bool else value
+
+    def set(self, value):
+        if self._columns is None:
+            slot.__set__(self, value)
+        else:
+            self._columns.columns[name][self._row] = convert(value)
+
+    return property(get, set)
+
+
+class ColumnarShow(Show):
+    """
+    A show whose numeric fields are kept in a ShowColumns, rather than in the show itself, while it is attached.
+    This lets ShowsFileHandler find, count and change many shows at once. See val.columnar_show_store
+    """
+    __slots__ = ()  # The slots of ColumnarShow are declared by Show
+
+    id = column_property("id")
+    ep = column_property("ep")
+    season = column_property("season")
+    weight = column_property("weight")
+    color = column_property("color")
+    is_hidden = column_property("is_hidden")
+    ended = column_property("ended")
+    ep_season_relevant = column_property("ep_season_relevant")
+    is_recently_released = column_property("is_recently_released")
+    last_dismissal = column_property("last_dismissal")
+
+    def __init__(self, *args, columns: Union[ShowColumns, None] = None, **kwargs):
+        object.__setattr__(self, "_columns", None)
+        object.__setattr__(self, "_row", -1)
+        super().__init__(*args, **kwargs)
+        if columns is not None:
+            self.attach(columns)
+
+    @classmethod
+    def from_show(cls, show: Show) -> "ColumnarShow":
+        """
+        Turns a plain Show into a detached ColumnarShow in place, so that whoever holds the show still holds the same
+        object. Returns show.
+        """
+        if not isinstance(show, cls):
+            object.__setattr__(show, "__class__", cls)
+            object.__setattr__(show, "_columns", None)
+            object.__setattr__(show, "_row", -1)
+        return show
+
+    @property
+    def release_info(self) -> ReleaseInfo:
+        """
+        The release info of the show. Parsed from the release string the first time it is used.
+        """
+        return Show.release_info.fget(self)
+
+    @release_info.setter
+    def release_info(self, new: ReleaseInfo):
+        Show.release_info.fset(self, new)
+        self.store_release_fields()
+
+    def store_release_fields(self):
+        """
+        Writes the parsed release info into the columns. Must be called if the release info is changed in place.
+        """
+        if self._columns is not None:
+            for name, value in zip(release_columns, self.release_info.get_fields()):
+                self._columns.columns[name][self._row] = value
+
+    def attach(self, columns: ShowColumns):
+        """
+        Moves the numeric fields of the show into a row of columns.
+        """
+        if self._columns is not None:
+            self.detach()
+        values = [(name, getattr(self, name)) for name in column_types if name not in release_columns]
+        object.__setattr__(self, "_row", columns.allocate(self))
+        object.__setattr__(self, "_columns", columns)
+        for name, value in values:
+            ColumnarShow.__dict__[name].__set__(self, value)
+        self.store_release_fields()
+
+    def detach(self):
+        """
+        Moves the numeric fields of the show out of its columns and back into the show itself.
+        """
+        if self._columns is None:
+            return
+        values = [(name, getattr(self, name)) for name in column_types if name not in release_columns]
+        self._columns.free(self._row)
+        object.__setattr__(self, "_columns", None)
+        object.__setattr__(self, "_row", -1)
+        for name, value in values:
+            Show.__dict__[name].__set__(self, value)
+
+    def is_attached_to(self, columns: ShowColumns) -> bool:
+        """
+        Returns True if the numeric fields of the show are kept in columns.
+        """
+        return self._columns is columns
+
+
+class ShowArchive:
+    """
+    The archive holds the shows that have ended. It is kept in a file of its own and is only read once something
+    actually needs the archived shows (such as searching), so that the main list only contains shows that are
+    still relevant.
+
+    Shows can be added to and removed from the archive without reading it, as the archive is stored with a journal.
+    """
+
+    def __init__(self, tracker: "ShowsFileHandler", savefile=val.archive_file, delimiter=val.csv_delimiter):
+        self.tracker = tracker
+        self.store = make_store(savefile, delimiter, backend="journal")
+        self.backups = BackupManager(self.store, backup_directory=os.path.join(val.backup_directory, "archive"))
+        self.writer = ShowsWriter(self.store, backups=self.backups) if val.save_in_background else None
+        self._shows: Union[dict[int, Show], None] = None  # None until the archive has been read
+        # The shows added or removed since the last save, keyed by id: the row of an added show and None for a removed
+        # show. Only the last of several changes to the same show counts, so the order of adds and removes is kept
+        self._pending: dict[str, Union[list[str], None]] = {}
+        self._dirty_shows: set[Show] = set()
+
+    def is_loaded(self) -> bool:
+        """
+        Returns True if the archive has been read.
+        """
+        return self._shows is not None
+
+    def load(self) -> list[Show]:
+        """
+        Reads the archive, if it hasn't been read already, and returns the archived shows.
+        """
+        if self._shows is None:
+            self.save()
+            self.flush()
+            self._shows = {}
+            for row in self.store.read_rows():
+                show = Show.from_row(row)
+                show.tracker = self.tracker
+                show.archived = True
+                self._shows[show.id] = show
+        return list(self._shows.values())
+
+    def add(self, show: Show):
+        """
+        Moves a show into the archive.
+        """
+        show.tracker = self.tracker
+        show.archived = True
+        show.is_recently_released = False
+        if self._shows is not None:
+            self._shows[show.id] = show
+        self._pending[str(show.id)] = show.as_row()
+
+    def remove(self, show: Show):
+        """
+        Removes a show from the archive.
+        """
+        show.archived = False
+        show.tracker = None
+        self._dirty_shows.discard(show)
+        if self._shows is not None:
+            self._shows.pop(show.id, None)
+        self._pending[str(show.id)] = None
+
+    def get(self, show_id: int) -> Union[Show, None]:
+        """
+        Returns the archived show with the given id, or None if there is none.
+        """
+        self.load()
+        return self._shows.get(show_id)
+
+    def discard_ids(self, ids):
+        """
+        Removes any archived show whose id is in ids. Used to clean up shows that ended up in both the main list and
+        the archive, because the program stopped while moving them.
+        """
+        for show in self.load():
+            if show.id in ids:
+                self.remove(show)
+
+    def show_changed(self, show: Show):
+        """
+        Called when a persisted attribute of an archived show changes.
+        """
+        self._dirty_shows.add(show)
+
+    def has_unsaved_changes(self) -> bool:
+        """
+        Returns True if anything has changed since the archive was last saved.
+        """
+        return bool(self._pending or self._dirty_shows)
+
+    def save(self):
+        """
+        Writes the changes to the archive. Changed shows are simply written anew.
+        """
+        if not self.has_unsaved_changes():
+            return
+        changes = RowChanges()
+        for show_id, row in self._pending.items():
+            if row is None:
+                changes.removed.append(show_id)
+            else:
+                changes.added.append(row)
+        changes = changes.merge(self._dirty_rows())
+        self._dirty_shows.clear()
+        self._pending = {}
+        if self.writer is not None:
+            self.writer.submit((), changes)
+        else:
+            self.store.save([], changes)
+            self.backups.maybe_backup()
+
+    def _dirty_rows(self) -> RowChanges:
+        """
+        Returns the changed shows as added rows, which replace the stored rows.
+        """
+        changes = RowChanges()
+        changes.added = [show.as_row() for show in self._dirty_shows]
+        return changes
+
+    def flush(self):
+        """
+        Blocks until everything saved has been written.
+        """
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self):
+        """
+        Saves and writes whatever is left.
+        """
+        self.save()
+        if self.writer is not None:
+            self.writer.close()
+        else:
+            self.store.close()
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+
+class ImportReport:
+    """
+    The outcome of ShowsFileHandler.import_shows.
+    """
+
+    def __init__(self):
+        self.imported = 0
+        self.errors: list[tuple[int, str]] = []  # (row number, what was wrong with the row)
+
+    def __str__(self):
+        lines = [f"Imported {self.imported} show(s), {len(self.errors)} row(s) failed"]
+        lines.extend(f"Row {row_number}: {error}" for row_number, error in self.errors)
+        return "\n".join(lines)
+
+
+# The fields of an exported show, in the order they are written
+bulk_fields = ("id", "title", "ep", "season", "links", "weight", "color", "ep_season_relevant", "release_string",
+               "last_dismissal", "is_hidden", "ended")
+
+
+def bulk_file_format(path: str) -> str:
+    """
+    Returns the format of an import or export file based on its extension. Either "jsonl" or "csv".
+    """
+    return "jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".json", ".ndjson") else "csv"
+
+
+def read_bulk_records(file, file_format: str):
+    """
+    Yields a record for every row of an import file, one row at a time. A record is a dict with (some of) the keys
+    in bulk_fields. Rows that aren't valid JSON are yielded as a string describing the problem.
+
+    :param file: An open text file
+    :param file_format: "csv" or "jsonl"
+    """
+    if file_format == "csv":
+        yield from csv.DictReader(file)
+    else:
+        for line in file:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as error:
+                    yield f"Invalid JSON: {error}"
+
+
+def show_from_bulk_record(record: dict) -> Show:
+    """
+    Creates a show from a record of an import file. The id of the record is not used.
+
+    :raises ValueError: If the record doesn't describe a valid show
+    """
+    if not isinstance(record, dict):
+        raise ValueError(record if isinstance(record, str) else "Not an object")
+    unknown = set(record) - set(bulk_fields)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(str(key) for key in unknown))}")
+    if not record.get("title"):
+        raise ValueError("The show has no title")
+
+    release_string = record.get("release_string") or ""
+    if release_string and parse_release_string(release_string) is False:
+        raise ValueError(f"Invalid release info: {release_string!r}")
+
+    links = record.get("links") or ""
+    if isinstance(links, list):
+        links = link_seperator.join(links)
+
+    def flag(key: str, default: bool) -> bool:
+        value = record.get(key)
+        if value is None or value == "":
+            return default
+        if isinstance(value, bool):
+            return value
+        if str(value) not in ("True", "False"):
+            raise ValueError(f"{key} must be True or False, not {value!r}")
+        return value == "True"
+
+    try:
+        return Show(title=record["title"],
+                    ep=record.get("ep") or 0,
+                    season=record.get("season") or 1,
+                    link_string=links,
+                    weight=record.get("weight") or 0,
+                    color=record.get("color") or 0,
+                    ep_season_relevant=flag("ep_season_relevant", True),
+                    release_string=release_string,
+                    last_dismissal=record.get("last_dismissal") or 0,
+                    is_hidden=flag("is_hidden", False),
+                    ended=flag("ended", False))
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Invalid number: {error}")
+
+
+def show_as_bulk_record(show: Show) -> dict:
+    """
+    Returns the show as a record of an export file. See show_from_bulk_record
+    """
+    return {"id": show.id, "title": show.title, "ep": show.ep, "season": show.season, "links": show.links,
+            "weight": show.weight, "color": show.color, "ep_season_relevant": show.ep_season_relevant,
+            "release_string": show.get_release_string(), "last_dismissal": show.last_dismissal,
+            "is_hidden": show.is_hidden, "ended": show.ended}
+
+
+class ReleaseScheduler:
+    """
+    Keeps the release status of the shows of a ShowsFileHandler up-to-date, without checking every show over and over.
+    A min-heap holds the next point in time at which the status of each show may change: when it is released, when its
+    grace period runs out or when its release times have to be worked out anew (see ReleaseInfo.compile).
+    Only the shows whose point in time has come are checked. Points in time are local seconds, see local_seconds.
+    """
+
+    def __init__(self, shows: "ShowsFileHandler"):
+        self.shows = shows
+        self._heap: list[tuple[int, int, Show]] = []  # Entries of (due, sequence number, show)
+        # The sequence number of the current entry of every scheduled show, keyed by id(show). Entries of the heap
+        # with any other sequence number are outdated and skipped once they reach the top.
+        self._current: dict[int, int] = {}
+        self._sequence = 0
+        self.check_count = 0  # The number of times a show has been checked
+
+    def __len__(self):
+        return len(self._current)
+
+    def next_due(self, show: Show, now: datetime.datetime) -> Union[int, None]:
+        """
+        Returns the point in time at which the release status of show may change next, or None if it can't change
+        unless the show is edited.
+        """
+        if show.ended or not show.release_info.is_defined():
+            return None
+        second = local_seconds(now)
+        release_info = show.release_info
+        try:
+            since = release_info.hours_since_release(now)
+        except ValueError:
+            since = None
+        times = release_info.get_release_times()
+        if times is None:  # The release times can't be cached, so the show is checked every minute
+            return second - now.second + 60
+        previous, _, _, due = times
+        if since < 0:  # Not released yet
+            due = min(due, previous)
+        else:
+            grace_period = self.shows.settings.release_grace_period
+            if grace_period and since <= grace_period:
+                # The first second (or minute, for weekdays) at which the hours since release exceed the grace period
+                expiry = int(previous + grace_period * 3600) + 1
+                if release_info.type == ReleaseInfo.TYPE_WEEKDAY:
+                    expiry += -expiry % 60
+                due = min(due, expiry)
+        if due >= _forever[1]:
+            return None
+        return max(due, second + 1)
+
+    def _push(self, show: Show, due: Union[int, None]):
+        """
+        Replaces the entry of show with one that is due at due. The show is no longer scheduled if due is None.
+        """
+        if due is None:
+            self._current.pop(id(show), None)
+            return
+        self._sequence += 1
+        self._current[id(show)] = self._sequence
+        heapq.heappush(self._heap, (due, self._sequence, show))
+        if len(self._heap) > 2 * len(self._current) + 64:  # Outdated entries are cleared out once they pile up
+            self._heap = [entry for entry in self._heap if self._current.get(id(entry[2])) == entry[1]]
+            heapq.heapify(self._heap)
+
+    def _check(self, show: Show, now: datetime.datetime, allow_notifications: bool) -> bool:
+        """
+        Checks the release status of show and schedules it anew.
+
+        :return: True if the release status changed
+        """
+        self.check_count += 1
+        previous_status = show.is_recently_released
+        show.check_release(self.shows.settings.release_grace_period, now)
+        self._push(show, self.next_due(show, now))
+        return self.shows.release_status_changed(show, previous_status, allow_notifications)
+
+    def schedule_all(self, now: datetime.datetime):
+        """
+        Schedules every show anew. The release status of each show must already be up-to-date.
+        """
+        self._current.clear()
+        self._heap = []
+        for show in self.shows:
+            due = self.next_due(show, now)
+            if due is not None:
+                self._sequence += 1
+                self._current[id(show)] = self._sequence
+                self._heap.append((due, self._sequence, show))
+        heapq.heapify(self._heap)
+
+    def check_soon(self, show: Show):
+        """
+        Has show checked at the next tick, such as a show that has just been added.
+        """
+        self._push(show, 0)
+
+    def reschedule(self, show: Show, now: Union[datetime.datetime, None] = None) -> bool:
+        """
+        Checks the release status of a show that has been edited right away, without sending a notification, and
+        schedules it anew.
+
+        :param now: The current time. Read from the clock of the shows if None
+        :return: True if the release status changed
+        """
+        if now is None:
+            now = self.shows.clock.now()
+        return self._check(show, now, allow_notifications=False)
+
+    def unschedule(self, show: Show):
+        """
+        Stops checking the release status of show.
+        """
+        self._push(show, None)
+
+    def tick(self, now: datetime.datetime, allow_notifications=True) -> list[Show]:
+        """
+        Checks the shows that are due.
+
+        :return: The shows whose release status changed
+        """
+        second = local_seconds(now)
+        changed = []
+        while self._heap and self._heap[0][0] <= second:
+            _, sequence, show = heapq.heappop(self._heap)
+            if self._current.get(id(show)) != sequence:
+                continue
+            del self._current[id(show)]
+            if self._check(show, now, allow_notifications):
+                changed.append(show)
+        return changed
+
+
+class ShowOrder:
+    """
+    Keeps the sort keys of the shows of a ShowsFileHandler, so that do_sorting only has to reposition the shows whose
+    key has changed, rather than sorting every show anew.
+    The keys don't change as time passes: the time till release and the time since dismissal are kept as the point in
+    time they refer to (in microseconds of local time, see local_seconds), which sorts the same way. Whatever else in a
+    key depends on the time, such as whether a show has been released, only changes at a known point in time, at which
+    the key expires.
+    """
+    # The attributes of a show that its sort key is made from.
+    # is_recently_released is handled by release_status_changed
+    key_attributes = frozenset(("title", "weight", "last_dismissal", "release_info", "ended"))
+
+    def __init__(self):
+        # The (weight_to_add, sort_by_upcoming) the keys were made with
+        self.mode: Union[tuple[int, bool], None] = None
+        # The key of every show in ShowsFileHandler.shows, in the same order. Only valid while in_sync is True
+        self.keys: list[int] = []
+        self.in_sync = False
+        self._key_of: dict[Show, int] = {}
+        self._stale: set[Show] = set()  # Shows whose key has to be made anew
+        # The collation rank of every title, see _rank_titles. Keys hold the rank of the title rather than the title.
+        # Kept by clear, as the ranks of titles that are still around don't change
+        self._ranks: dict[str, int] = {}
+        self._dismissals: dict[float, int] = {}  # See _dismissal_microseconds
+        # The shows whose key expires at a local second, along with a min-heap of those seconds. Many shows share one
+        self._expiring: dict[int, list[Show]] = {}
+        self._expiries: list[int] = []
+        self._num_expiring = 0
+        self.reposition_count = 0  # The number of times a single show has been repositioned
+        self.rebuild_count = 0  # The number of times every show has been sorted
+
+    def clear(self):
+        """
+        Forgets every key, so that all shows are sorted anew next time.
+        """
+        self.keys = []
+        self.in_sync = False
+        self._key_of.clear()
+        self._stale.clear()
+        self._dismissals.clear()
+        self._expiring.clear()
+        self._expiries = []
+        self._num_expiring = 0
+
+    def mark_stale(self, show: Show):
+        """
+        Has the key of show made anew the next time the shows are sorted.
+        """
+        if show in self._key_of:
+            self._stale.add(show)
+
+    def added(self, show: Show):
+        """
+        Called when a show has been added to the shows.
+        """
+        self.in_sync = False
+        self._key_of.pop(show, None)
+
+    def removed(self, show: Show):
+        """
+        Called when a show has been removed from the shows.
+        """
+        self.in_sync = False
+        self._key_of.pop(show, None)
+        self._stale.discard(show)
+
+    def _expire_at(self, show: Show, expiry: int):
+        """
+        Has the key of show made anew once the local second expiry is reached.
+        """
+        shows_expiring = self._expiring.get(expiry)
+        if shows_expiring is None:
+            self._expiring[expiry] = [show]
+            heapq.heappush(self._expiries, expiry)
+        else:
+            shows_expiring.append(show)
+        self._num_expiring += 1
+
+    def take_stale(self, now: datetime.datetime) -> set[Show]:
+        """
+        Returns the shows whose key has to be made anew, including those whose key has expired by now.
+        """
+        if self._num_expiring > 2 * len(self._key_of) + 64:  # Shows that are gone are cleared out once they pile up
+            for shows_expiring in self._expiring.values():
+                shows_expiring[:] = [show for show in shows_expiring if show in self._key_of]
+            self._num_expiring = sum(map(len, self._expiring.values()))
+        second = local_seconds(now)
+        while self._expiries and self._expiries[0] <= second:
+            shows_expiring = self._expiring.pop(heapq.heappop(self._expiries))
+            self._num_expiring -= len(shows_expiring)
+            self._stale.update(show for show in shows_expiring if show in self._key_of)
+        stale, self._stale = self._stale, set()
+        return stale
+
+    def sort(self, shows: list[Show], mode: tuple[int, bool], now: datetime.datetime) -> bool:
+        """
+        Sorts shows in place. Only the shows whose key has changed are repositioned, unless shows have been added or
+        removed since the last time, in which case every show is sorted with the keys that are still valid.
+
+        :param shows: The shows of the ShowsFileHandler
+        :param mode: The (weight_to_add, sort_by_upcoming) given to ShowsFileHandler.do_sorting
+        :return: True if the shows have changed order
+        """
+        if self.mode != mode:
+            self.clear()
+            self.mode = mode
+
+        stale = self.take_stale(now)
+        ranks = self._ranks
+        if not self.in_sync or len(stale) > len(shows) // 16 or any(show.title not in ranks for show in stale):
+            # Sorting everything is faster than repositioning many shows one at a time. The missing keys are made in a
+            # single pass, and the positions are then sorted by key, which keeps the sort stable.
+            key_of = self._key_of
+            try:
+                if key_of:
+                    missing = [show for show in shows if show in stale or show not in key_of]
+                    key_of.update(zip(missing, self.make_keys(missing, now)))
+                    keys = list(map(key_of.__getitem__, shows))
+                else:
+                    keys = self.make_keys(shows, now)
+                    key_of.update(zip(shows, keys))
+            except KeyError:
+                # A title hasn't been ranked yet. As the rank of the title is part of every key, every key is made anew
+                self._rank_titles(shows)
+                key_of.clear()
+                keys = self.make_keys(shows, now)
+                key_of.update(zip(shows, keys))
+            positions = sorted(range(len(shows)), key=keys.__getitem__)
+            reordered = positions != list(range(len(shows)))
+            if reordered:
+                shows[:] = map(shows.__getitem__, positions)
+            self.keys = list(map(keys.__getitem__, positions))
+            self.in_sync = True
+            self.rebuild_count += 1
+            return reordered
+
+        reordered = False
+        for show in stale:
+            # The show is found from its old key, then inserted where its new key belongs
+            old_index = bisect_left(self.keys, self._key_of[show])
+            while shows[old_index] is not show:
+                old_index += 1
+            del shows[old_index]
+            del self.keys[old_index]
+            key = self.make_keys([show], now)[0]
+            self._key_of[show] = key
+            index = bisect_right(self.keys, key)
+            shows.insert(index, show)
+            self.keys.insert(index, key)
+            self.reposition_count += 1
+            reordered = reordered or index != old_index
+        return reordered
+
+    def _rank_titles(self, shows: list[Show]):
+        """
+        Ranks the titles of shows in the order they are sorted in: casefolded, so that case doesn't matter, and then as
+        they are. Titles that are equal get the same rank.
+        """
+        titles = sorted({show.title for show in shows})
+        titles.sort(key=str.casefold)
+        self._ranks = {title: rank for rank, title in enumerate(titles)}
+
+    def make_keys(self, shows: list[Show], now: datetime.datetime) -> list[int]:
+        """
+        Returns the sort keys of shows according to .mode, and has each of them made anew once it expires.
+        Every key is a single integer, which packs the sorting weight, and when sorting by upcoming the tier and the
+        point in time (in microseconds) as well, with the rank of the title last. See ShowsFileHandler.do_sorting
+        """
+        weight_to_add, sort_by_upcoming = self.mode
+        ranks = self._ranks
+        num_of_ranks = len(ranks)
+        if not sort_by_upcoming:
+            # The 'sorting weight' reflects both the weight of the show and its release status. Note that the polarity
+            # of numbers is reversed.
+            return [(-show.weight - weight_to_add if show.is_recently_released else -show.weight) * num_of_ranks
+                    + ranks[show.title] for show in shows]
+
+        second = local_seconds(now)
+        minute = second - now.second
+        moment = second * 1_000_000 + now.microsecond
+        is_fractional = now.microsecond > 0
+        undefined, weekday = ReleaseInfo.TYPE_UNDEFINED, ReleaseInfo.TYPE_WEEKDAY
+        latest = _forever[1]
+        dismissals = self._dismissals
+        expire_at = self._expire_at
+        keys = []
+        for show in shows:
+            sorting_weight = -show.weight - weight_to_add if show.is_recently_released else -show.weight
+            dismissal = dismissals.get(show.last_dismissal)
+            if dismissal is None:
+                dismissal = self._dismissal_microseconds(show.last_dismissal)
+            seconds_since_dismissal = (moment - dismissal) // 1_000_000
+            release_info = show.release_info
+            release_type = release_info.type
+            times = None
+            if release_type != undefined:  # The release times are worked out anew once they no longer hold
+                if not release_info._valid_from <= minute < release_info._valid_until:
+                    release_info.compile(now)
+                times = release_info.get_release_times()
+
+            # Like Show.was_dismissed and Show.hours_to_release, but in whole seconds from the cached release times.
+            # A time till release that rounds to 0 hours (see Show.hours_to_release) is sorted last, whether among
+            # released shows or among those that aren't coming up.
+            if times is None:
+                hours_since_dismissal = seconds_since_dismissal / 3600
+                if hours_since_dismissal < release_info.hours_since_two_releases(now):
+                    secondary = show.hours_to_release(now)
+                    point = latest if secondary == 0 else moment + round(secondary * 3_600_000_000)
+                else:
+                    secondary = -hours_since_dismissal
+                    point = dismissal
+                is_upcoming = secondary > 0
+                expiry = minute + 60 if release_type != undefined else latest
+            else:
+                if release_type == weekday:
+                    was_dismissed = seconds_since_dismissal < minute - times[0] + 24 * 7 * 3600
+                    till = times[1] - minute
+                else:
+                    was_dismissed = seconds_since_dismissal < 0
+                    till = times[1] - second - is_fractional
+                if not was_dismissed:
+                    point = dismissal
+                    is_upcoming = seconds_since_dismissal < 0
+                elif show.ended or -2 < till < 2:
+                    point = latest
+                    is_upcoming = False
+                else:
+                    point = times[1] * 1_000_000
+                    is_upcoming = till > 0
+                expiry = times[3]
+            tier = 0 if show.is_recently_released else 1 if is_upcoming else 2
+
+            # Whether the show was dismissed and the release times only change at the end of the cached release
+            # times, or, for shows without a release, a week after dismissal. The tier changes when the point in time
+            # is reached.
+            if release_type == undefined and dismissal + 24 * 7 * 3_600_000_000 > moment:
+                expiry = -(-(dismissal + 24 * 7 * 3_600_000_000) // 1_000_000)
+            if moment < point < latest and point < expiry * 1_000_000:
+                expiry = -(-point // 1_000_000)
+            if moment < dismissal < expiry * 1_000_000:
+                expiry = -(-dismissal // 1_000_000)
+            # The point in time is shifted to be non-negative, so that it fits in the 64 bits below the tier
+            keys.append(((sorting_weight * 3 + tier) * 2 ** 64 + point - _forever[0]) * num_of_ranks
+                        + ranks[show.title])
+            if expiry < latest:
+                expire_at(show, expiry if expiry > second else second + 1)
+        return keys
+
+    def _dismissal_microseconds(self, last_dismissal: float) -> int:
+        """
+        Returns a dismissal as whole microseconds of local time since 1970-01-01 00:00, like local_seconds.
+        Many shows share a dismissal (0 if they have never been dismissed), so the results are remembered.
+        """
+        microseconds = self._dismissals.get(last_dismissal)
+        if microseconds is None:
+            dismissal = datetime.datetime.fromtimestamp(last_dismissal)
+            microseconds = local_seconds(dismissal) * 1_000_000 + dismissal.microsecond
+            self._dismissals[last_dismissal] = microseconds
+        return microseconds
+
+
 class ShowsFileHandler:
     """
     Note: This class was made as a replacement to using a single list, therefore this class acts like
@@ -552,84 +1779,337 @@ class ShowsFileHandler:
     The list in question is equivalent to the list self.shows
     """
 
-    def __init__(self, settings, savefile=val.show_file, delimiter=val.csv_delimiter):
+    def __init__(self, settings, savefile=val.show_file, delimiter=val.csv_delimiter,
+                 clock: Union[Clock, None] = None):
         self.savefile = savefile
+        self.clock = clock if clock is not None else Clock()  # Where every check of the shows gets the time from
         self.shows = []
         self.delimiter = delimiter
         self.settings: Settings = settings
-
-        self.ensure_file_exists()
+        self.store = make_store(savefile, delimiter)
+        self.backups = BackupManager(self.store)
+        self.writer = ShowsWriter(self.store, backups=self.backups) if val.save_in_background else None
+        self._saved_rows: dict[str, list[str]] = {}  # The rows as they are on disk, keyed by id
+        self._by_id: dict[int, Show] = {}  # Every show in self.shows keyed by id
+        # The id given to the next new show. Ids are never reused. None until needed, as the archive must be read
+        self._next_id: Union[int, None] = None
+        # The shows that are shown when hidden shows aren't displayed, in the order of self.shows, along with the
+        # position of each show within it. None when it has to be rebuilt, which is done the next time it is needed.
+        self._visible: Union[list[Show], None] = None
+        self._visible_index: dict[Show, int] = {}
+        self.visible_view_rebuild_count = 0
+        # With the columnar store, the numeric fields of every show in self.shows are kept in self.columns
+        self.columns: Union[ShowColumns, None] = None
+
+        # Change tracking. version is increased whenever a persisted attribute of a show changes, or a show is added
+        # or removed. If it is the same as when the shows were last saved, then there is nothing to save.
+        self.version = 0
+        self._saved_version = 0
+        self._dirty_shows: set[Show] = set()
+        self._structure_changed = False  # True if shows have been added, removed or have changed id since last save
+
+        # Ended shows are moved to the archive, so that they are left out of everything done periodically.
+        self.archive = ShowArchive(self, delimiter=delimiter)
+        self._tier_moves: set[Show] = set()  # Shows that may have to move to or from the archive
+
+        # Checks the release status of a show only when it may change, see update_releases
+        self.scheduler = ReleaseScheduler(self)
+        # The sort keys of the shows, so that do_sorting only repositions the shows whose key has changed
+        self.order = ShowOrder()
 
         self.read_file()
 
-    def ensure_file_exists(self):
+    def read_file(self) -> List[Show]:
+        """
+        Reads the save file into memory and therefore updates self.shows
+        """
+        self.flush()
+        show_class, kwargs = Show, {}
+        if val.columnar_show_store:
+            self.columns = ShowColumns()
+            show_class, kwargs = ColumnarShow, {"columns": self.columns}
+        records = self.read_binary_snapshot()
+        if records is not None:
+            self.shows = [show_class.from_snapshot_record(record, **kwargs) for record in records]
+        else:
+            self.shows = [show_class.from_row(row, **kwargs) for row in self.store.read_rows()]
+        for show in self.shows:
+            show.tracker = self
+        self._by_id = {show.id: show for show in self.shows}
+        self._next_id = None
+        self._visible = None
+        self.order.clear()
+        self._saved_rows = {row[0]: row for row in (show.as_row() for show in self.shows)}
+        self._dirty_shows.clear()
+        self._structure_changed = False
+        self._saved_version = self.version
+
+        # Ended shows that are still in the main list, such as those saved by older versions, are moved to the archive
+        self._tier_moves = {show for show in self.shows if show.ended}
+        if self._tier_moves and val.archive_ended_shows:
+            self.apply_tier_moves()
+            self.save()
+            self.flush()
+            records = None
+
+        self.check_all_releases(allow_notifications=False)
+        if records is None:
+            self.write_binary_snapshot()
+        return self.shows
+
+    def snapshot_file(self) -> Union[str, None]:
         """
-        Checks if the save file exists. If not, the file is created.
+        Returns the path of the binary snapshot, or None if no snapshot should be used.
         """
-        if not os.path.isfile(self.savefile):
-            with open(self.savefile, "w"):
-                pass
+        if not val.use_show_snapshot or self.store.source_files() is None:
+            return None
+        return f"{self.savefile}.snapshot"
 
-    def read_file(self) -> List[Show]:
+    def read_binary_snapshot(self) -> Union[list[tuple], None]:
         """
-        Reads the save file into memory and therefore updates self.shows
+        Returns the records of the binary snapshot, if the snapshot still matches the files it was made from.
+        """
+        path = self.snapshot_file()
+        if path is None or not os.path.isfile(path):
+            return None
+        return read_snapshot(path, snapshot_key(self.store.source_files()))
+
+    def write_binary_snapshot(self):
+        """
+        Writes a binary snapshot of the shows, which allows them to be loaded much faster next time. This must only be
+        done when the shows in memory are the same as the shows on disk.
+        """
+        path = self.snapshot_file()
+        if path is None:
+            return
+        try:
+            write_snapshot(path, snapshot_key(self.store.source_files()),
+                           [show.as_snapshot_record() for show in self.shows])
+        except OSError:  # The snapshot is only a cache. Without it, the shows are simply loaded from the save file
+            pass
+
+    def show_changed(self, show: Show, attribute: str):
+        """
+        Called by a show whenever one of its persisted attributes changes.
+        """
+        self.version += 1
+        if attribute == "ended":
+            self._tier_moves.add(show)
+        elif attribute == "id" and not show.archived:
+            self._reindex(show)
+        elif attribute == "is_hidden":
+            self._visible = None
+        if show.archived:
+            self.archive.show_changed(show)
+            return
+        if attribute in ("release_info", "last_dismissal", "ended"):
+            self.scheduler.reschedule(show)
+        if attribute in ShowOrder.key_attributes:
+            self.order.mark_stale(show)
+        show.dirty = True
+        self._dirty_shows.add(show)
+        if attribute == "id":
+            self._structure_changed = True
+
+    def apply_tier_moves(self):
+        """
+        Moves shows that have ended into the archive and shows that are no longer ended out of it.
+        """
+        if not val.archive_ended_shows:
+            self._tier_moves.clear()
+            return
+        for show in self._tier_moves:
+            if show.archived and not show.ended:
+                self.archive.remove(show)
+                self.append(show)
+            elif not show.archived and show.ended and show.tracker is self:
+                self.remove(show)
+                self.archive.add(show)
+        self._tier_moves.clear()
+
+    def _adopt(self, show: Show) -> Show:
+        """
+        Returns the show as it should be held in self.shows, which is always show itself. With the columnar store, a
+        plain Show is turned into a ColumnarShow and attached to self.columns.
+        """
+        if self.columns is None or (isinstance(show, ColumnarShow) and show.is_attached_to(self.columns)):
+            return show
+        ColumnarShow.from_show(show).attach(self.columns)
+        return show
+
+    def _track(self, show: Show):
+        """
+        Starts tracking changes to a show that has been added.
+        """
+        show.tracker = self
+        self._by_id[show.id] = show
+        if self._next_id is not None and show.id >= self._next_id:
+            self._next_id = show.id + 1
+        self._visible = None
+        self.version += 1
+        self._structure_changed = True
+        if show.ended:
+            self._tier_moves.add(show)
+        self.scheduler.check_soon(show)
+        self.order.added(show)
+
+    def _untrack(self, show: Show):
+        """
+        Stops tracking changes to a show that has been removed.
+        """
+        show.tracker = None
+        if self._by_id.get(show.id) is show:
+            del self._by_id[show.id]
+        if self.columns is not None and isinstance(show, ColumnarShow) and show.is_attached_to(self.columns):
+            show.detach()
+        self.scheduler.unschedule(show)
+        self.order.removed(show)
+        self._visible = None
+        self._dirty_shows.discard(show)
+        self.version += 1
+        self._structure_changed = True
+
+    def has_unsaved_changes(self) -> bool:
+        """
+        Returns True if anything has changed since the shows were last saved.
+        """
+        return self.version != self._saved_version
+
+    def save(self) -> bool:
+        """
+        Writes the current self.shows to disk, if anything has changed since the last save. Only the changes since the
+        last save are handed to the store, which the journal uses to avoid rewriting the whole file.
+        If shows are saved in the background, this method only hands the changes to the writer thread.
+
+        :return: True if something was written to disk
+        """
+        self.apply_tier_moves()
+        if self.archive.has_unsaved_changes():
+            # The archive is written first. Should the program stop before the main list is written, then the
+            # show is in both, which is cleaned up the next time the archive is read - rather than in neither.
+            self.archive.save()
+            self.archive.flush()
+
+        if not self.has_unsaved_changes():
+            return False
+
+        if self._structure_changed:
+            rows = [show.as_row() for show in self.shows]
+            changes = diff_rows(self._saved_rows, rows)
+            self._saved_rows = {row[0]: row for row in rows}
+        else:
+            changes = RowChanges()
+            for show in self._dirty_shows:
+                row = show.as_row()
+                changes.add_difference(self._saved_rows[row[0]], row)
+                self._saved_rows[row[0]] = row
+            rows = [show.as_row() for show in self.shows] if changes and self.store.writes_all_rows else []
+
+        for show in self._dirty_shows:
+            show.dirty = False
+        self._dirty_shows.clear()
+        self._structure_changed = False
+        self._saved_version = self.version
+
+        if not changes:  # Values were changed and then changed back
+            return False
+        if self.writer is not None:
+            self.writer.submit(tuple(rows), changes)
+        else:
+            self.store.save(rows, changes)
+            self.backups.maybe_backup()
+        return True
+
+    def restore_backup(self, generation: str):
+        """
+        Replaces all shows with the shows of a generation of backups, and saves them. See BackupManager.
+        Restored shows that have since been archived are removed from the archive.
         """
+        self.flush()
+        for show in self.shows:
+            self._untrack(show)
+        self._tier_moves.difference_update(self.shows)
         self.shows = []
-        with open(self.savefile, newline="", encoding="utf-8") as csvfile:
-            reader = csv.reader(csvfile, delimiter=self.delimiter, quotechar="|")
-            for row in reader:
-                self.shows.append(Show(
-                    num_id=row[0],
-                    title=row[1],
-                    ep=row[2],
-                    season=row[3],
-                    link_string=row[4],
-                    weight=row[5],
-                    color=row[6],
-                    ep_season_relevant=row[7] if len(row) > 7 else None,
-                    release_string=row[8] if len(row) > 8 else "",
-                    last_dismissal=row[9] if len(row) > 9 else 0,
-                    is_hidden=row[10] if len(row) > 10 else None,
-                    ended=row[11] if len(row) > 11 else None,
-                ))
+        self._next_id = None
+        self.order.clear()
+        for row in self.backups.read_generation(generation):
+            self.append(Show.from_row(row))
+        self.archive.discard_ids(self._by_id)
         self.check_all_releases(allow_notifications=False)
-        return self.shows
+        self.save()
 
-    def save(self):
+    def flush(self):
         """
-        Writes the current self.shows to disk.
+        Blocks until every save handed to the writer thread has been written.
         """
-        now = datetime.datetime.now()
-        tempsavefile = f"saved.csv.temp.{now.year}.{now.month}.{now.day}.{now.hour}.{now.minute}.{now.second}"
-        with open(tempsavefile, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile, delimiter=self.delimiter, quotechar="|")
-            for show in self.shows:
-                writer.writerow([show.id, show.title, show.ep, show.season, show.get_link_string(), show.weight, show.color,
-                                 show.ep_season_relevant, show.release_info.release_string,
-                                 show.last_dismissal, show.is_hidden, show.ended])
-        back_up_saved = "auto_back_saved.csv"
-        if os.path.exists(back_up_saved):
-            os.remove(back_up_saved)
-        os.rename(self.savefile, back_up_saved)
-        os.rename(tempsavefile, self.savefile)
+        if self.writer is not None:
+            self.writer.flush()
+        self.archive.flush()
+
+    def get_archive(self) -> list[Show]:
+        """
+        Returns every archived show, reading the archive if necessary. Shows found in both the main list and the
+        archive are removed from the archive.
+        """
+        was_loaded = self.archive.is_loaded()
+        archived = self.archive.load()
+        if not was_loaded:
+            if any(show.id in self._by_id for show in archived):
+                self.archive.discard_ids(self._by_id)
+                archived = self.archive.load()
+        return archived
+
+    def delete_archived(self, show: Show):
+        """
+        Deletes a show from the archive for good.
+        """
+        self._tier_moves.discard(show)
+        self.archive.remove(show)
+        self.version += 1  # So that the deletion is saved along with the next save
+
+    def all_shows(self) -> list[Show]:
+        """
+        Returns the shows of the main list followed by the archived shows.
+        """
+        return self.shows + self.get_archive()
+
+    def close(self):
+        """
+        Writes whatever is left and lets the store finish anything it is doing in the background.
+        Thereafter, a binary snapshot is written if the shows on disk are up-to-date.
+        """
+        self.archive.close()
+        if self.writer is not None:
+            self.writer.close()
+            up_to_date = not self.writer.has_failed()
+        else:
+            self.store.close()
+            up_to_date = True
+        if up_to_date and not self.has_unsaved_changes():
+            self.write_binary_snapshot()
 
     def pop(self, __index) -> Show:
         """
         Intermediary method allowing for list-like behavior
         """
-        return self.shows.pop(__index)
+        show = self.shows.pop(__index)
+        self._untrack(show)
+        return show
 
     def append(self, __object):
         """
         Intermediary method allowing for list-like behavior
         """
+        __object = self._adopt(__object)
         self.shows.append(__object)
+        self._track(__object)
 
     def remove(self, __value):
         """
         Intermediary method allowing for list-like behavior
         """
         self.shows.remove(__value)
+        self._untrack(__value)
 
     def get_index(self, __object: Show) -> int:
         """
@@ -643,29 +2123,49 @@ class ShowsFileHandler:
         """
         return self.shows[int(__index)]
 
-    def from_index_ignore_hidden(self, __index: Union[str, int]) -> Show:
+    def visible_shows(self) -> list[Show]:
+        """
+        Returns the shows in self.shows where is_hidden is False OR is_recently_released is True, in the same order.
+        The list is kept until the shows are sorted, added, removed, hidden or change release status, so it must not
+        be changed.
         """
-        Returns a show from index. Ignores hidden shows.
+        if self._visible is None:
+            self._visible = [show for show in self.shows if not show.is_hidden or show.is_recently_released]
+            self._visible_index = {show: index for index, show in enumerate(self._visible)}
+            self.visible_view_rebuild_count += 1
+        return self._visible
+
+    def from_index_ignore_hidden(self, __index: Union[str, int]) -> Union[Show, None]:
+        """
+        Returns a show from index. Ignores hidden shows. Returns None if there is no such show.
         """
         __index = int(__index)
-        skipped = 0
-        for index, show in enumerate(self.shows):
-            if show.is_hidden and not show.is_recently_released:
-                skipped += 1
-                continue
-            if index - skipped == __index:
-                return show
+        visible = self.visible_shows()
+        if 0 <= __index < len(visible):
+            return visible[__index]
+        return None
+
+    def get_index_ignore_hidden(self, __object: Show) -> int:
+        """
+        Retrieves the index of a given show, ignoring hidden shows. The opposite of from_index_ignore_hidden.
+        """
+        self.visible_shows()
+        return self._visible_index[__object]
 
     def get_num_of_shown(self) -> int:
         """
         Returns the number of items in self.shows where is_hidden is False OR is_recently_released is True
         """
-        return sum([not i.is_hidden or i.is_recently_released for i in self.shows])
+        if self._visible is None and self.columns is not None:
+            return self.columns.count_visible()
+        return len(self.visible_shows())
 
     def get_recently_released_shows(self):
         """
-        Returns a list of all recently released shows
+        Returns a list of all recently released shows. With the columnar store, they aren't in the order of self.shows
         """
+        if self.columns is not None:
+            return self.columns.shows_where(is_recently_released=True)
         recently_released = []
         for show in self.shows:
             if show.is_recently_released:
@@ -682,7 +2182,16 @@ class ShowsFileHandler:
         """
         Intermediary method allowing for list-like behavior
         """
+        replaced = self.shows[key]
+        if isinstance(key, slice):
+            value = [self._adopt(show) for show in value]
+        else:
+            value = self._adopt(value)
         self.shows[key] = value
+        for show in (replaced if isinstance(key, slice) else [replaced]):
+            self._untrack(show)
+        for show in (value if isinstance(key, slice) else [value]):
+            self._track(show)
 
     def __iter__(self):
         """
@@ -696,71 +2205,98 @@ class ShowsFileHandler:
         """
         return len(self.shows)
 
-    def check_all_releases(self, allow_notifications=True):
+    def recently_released_statuses(self, now: Union[datetime.datetime, None] = None) -> list[bool]:
+        """
+        Returns the result of Show.check_release for every show in self.shows, computed all at once.
+        See recently_released_batch
+
+        :param now: The current time. Read from self.clock if None
+        """
+        if now is None:
+            now = self.clock.now()
+        grace_period = self.settings.release_grace_period
+        if self.columns is None:
+            return recently_released_batch(now, [show.release_info.get_fields() for show in self.shows],
+                                           [show.ended for show in self.shows],
+                                           [show.last_dismissal for show in self.shows], grace_period)
+        # Every row of the columns is computed, in the order of the rows
+        columns = self.columns.columns
+        statuses = recently_released_batch(now, list(zip(*(columns[name] for name in release_columns))),
+                                           columns["ended"], columns["last_dismissal"], grace_period)
+        return [statuses[show._row] for show in self.shows]
+
+    def check_all_releases(self, allow_notifications=True, now: Union[datetime.datetime, None] = None):
         """
         Updates the release status of all shows. If allow_notifications and settings.send_notifications is True, then
         a notification will also be sent if any show changes state from unreleased to recently released.
+        Thereafter, every show is scheduled anew. See update_releases
+
+        :param now: The current time. Read from self.clock if None
         """
-        for show in self.shows:
+        if now is None:
+            now = self.clock.now()
+        self.apply_tier_moves()
+        for show, recently_released in zip(self.shows, self.recently_released_statuses(now)):
             prev_status = show.is_recently_released
-            show.check_release(self.settings.release_grace_period)
+            show.is_recently_released = recently_released
+            self.release_status_changed(show, prev_status, allow_notifications)
+        self.scheduler.schedule_all(now)
 
-            if allow_notifications and self.settings.send_notifications \
-                    and True is show.is_recently_released != prev_status:
-                show.send_release_notification()
+    def update_releases(self, allow_notifications=True, now: Union[datetime.datetime, None] = None) -> list[Show]:
+        """
+        Updates the release status of the shows whose status may have changed since they were last checked, rather
+        than that of every show. See ReleaseScheduler
 
-            if True is show.is_recently_released != prev_status and show.auto_open_link_on_release:
-                show.open_link()
-                show.auto_open_link_on_release = False
+        :param now: The current time. Read from self.clock if None
+        :return: The shows whose release status changed
+        """
+        if now is None:
+            now = self.clock.now()
+        self.apply_tier_moves()
+        return self.scheduler.tick(now, allow_notifications)
 
-    def do_sorting(self, weight_to_add=0, sort_by_upcoming=False):
+    def release_status_changed(self, show: Show, prev_status: bool, allow_notifications=True) -> bool:
+        """
+        Handles a show whose release status has just been updated. If it has become recently released, a notification
+        is sent (if allow_notifications and settings.send_notifications is True) and its link may be opened.
+
+        :param prev_status: The release status of the show before it was updated
+        :return: True if the release status changed
+        """
+        if show.is_recently_released == prev_status:
+            return False
+        self.order.mark_stale(show)
+        if show.is_hidden:
+            self._visible = None
+
+        if allow_notifications and self.settings.send_notifications and show.is_recently_released:
+            show.send_release_notification()
+
+        if show.is_recently_released and show.auto_open_link_on_release:
+            show.open_link()
+            show.auto_open_link_on_release = False
+        return True
+
+    def do_sorting(self, weight_to_add=0, sort_by_upcoming=False, now: Union[datetime.datetime, None] = None) -> bool:
         """
         Sorts self.shows according firstly to their weights and secondarily according to their
-        titles alphabetically. However, if sort_by_upcoming is true, the shows are secondarily sorted by time until
-        release instead of alphabetically. If the release info is the same, then they are sorted alphabetically.
+        titles alphabetically, ignoring case. However, if sort_by_upcoming is true, the shows are secondarily sorted by
+        time until release instead of alphabetically. If the release info is the same, then they are sorted
+        alphabetically.
 
         :param weight_to_add: The amount of weight that should be added to a show when it is recently released.
         :param sort_by_upcoming: If True, shows of the same weight will be sorted based on when a new release is coming.
-        """
-
-        def get_sorting_weight(show: Show) -> int:
-            """
-            Returns the 'sorting weight' of a show. This is the number that reflects both the
-            weight of the show and its release status. Note that the polarity of numbers is reversed.
-            """
-            if show.is_recently_released:
-                return -show.weight - weight_to_add
-            return -show.weight
-
-        def main_key(show: Show):
-            """
-            The key used in the list.sort method, that will sort the shows firstly according to their weight
-            and secondly according to their title (alphabetically)
-            """
-            return get_sorting_weight(show), show.title
-
-        def upcoming_key(show: Show):
-            """
-            Returns a key, that, when given to the .sort method, will properly sort the shows. This proper sorting is as
-            follows:
-            Firstly, according to the sorting weight of the shows.
-            Secondly, shows that are currently released are placed at the top.
-            Thirdly, according to how long there is until their release. Note that shows without a release schedule are
-                sorted as if they are going to be released in an infinite amount of time.
-            Fourthly, alphabetically (According to show.title).
-            """
-            if show.was_dismissed():
-                secondary = show.hours_to_release()
-            else:
-                secondary = -show.hours_since_last_dismissal()
-            if show.is_recently_released:
-                return get_sorting_weight(show), 0, secondary if secondary != 0.0 else 99999999, show.title
-            return get_sorting_weight(show), 1 if secondary > 0 else 2, secondary, show.title
+        Only the shows whose sort key has changed since the last call are repositioned. See ShowOrder
 
-        if sort_by_upcoming:
-            self.shows.sort(key=upcoming_key)
-        else:
-            self.shows.sort(key=main_key)
+        :param now: The current time. Read from self.clock if None
+        :return: True if the shows have changed order
+        """
+        if now is None:
+            now = self.clock.now()
+        if self.order.sort(self.shows, (weight_to_add, sort_by_upcoming), now):
+            self._visible = None
+            return True
+        return False
 
     def new_text_colors(self, old: List[str], new: List[str]):
         """
@@ -773,7 +2309,7 @@ class ShowsFileHandler:
         :param old: The old text_colors
         :param new: The new text_colors
         """
-        for show in self.shows:
+        for show in self.all_shows():
             try:
                 show.color = new.index(old[show.color])
             except ValueError:
@@ -781,28 +2317,229 @@ class ShowsFileHandler:
                     continue
                 show.color = 0
 
-    def highest_id(self) -> int:
+    def shows_where(self, **conditions) -> list[Show]:
+        """
+        Returns the shows in self.shows whose attributes equal the given values, e.g. shows_where(color=2, weight=0).
+        With the columnar store, only the attributes kept in columns can be used, and the shows are not in the order
+        of self.shows.
+        """
+        if self.columns is not None:
+            return self.columns.shows_where(**conditions)
+        return [show for show in self.shows if all(getattr(show, name) == value for name, value in conditions.items())]
+
+    def count_where(self, **conditions) -> int:
+        """
+        Returns the number of shows in self.shows whose attributes equal the given values. See shows_where
+        """
+        if self.columns is not None:
+            return self.columns.count_where(**conditions)
+        return len(self.shows_where(**conditions))
+
+    def count_by(self, attribute: str) -> dict[Any, int]:
+        """
+        Returns how many shows in self.shows have each value of an attribute.
+        """
+        if self.columns is not None:
+            return dict(self.columns.count_by(attribute))
+        counts = {}
+        for show in self.shows:
+            value = getattr(show, attribute)
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def recolor(self, new_color: int, **conditions) -> int:
+        """
+        Gives every show whose attributes equal the given values a new color. See shows_where
+
+        :return: The number of shows that were recolored
+        """
+        selected = self.shows_where(**conditions)
+        for show in selected:
+            show.color = new_color
+        return len(selected)
+
+    def reweight(self, change: dict[int, int]) -> int:
+        """
+        Changes the weights of shows. Every show is changed at most once, according to the weight it had beforehand.
+
+        :param change: The new weight for each old weight
+        :return: The number of shows that were changed
+        """
+        selections = [(self.shows_where(weight=old), new) for old, new in change.items() if old != new]
+        for selected, new in selections:
+            for show in selected:
+                show.weight = new
+        return sum(len(selected) for selected, _ in selections)
+
+    def import_shows(self, path: str, file_format: Union[str, None] = None, progress=None) -> ImportReport:
+        """
+        Adds every show in an import file. The file is read one row at a time, so it never has to fit in memory.
+        Imported shows are given new ids. Rows that aren't valid shows are skipped and reported.
+        The shows are sorted and saved once, after everything has been imported.
+
+        :param path: Path of a CSV file with a header row of bulk_fields, or a JSON-lines file of objects with those
+                     keys
+        :param file_format: "csv" or "jsonl". Inferred from the extension of path if None
+        :param progress: Called with the number of rows read so far every val.bulk_progress_interval rows, and once
+                         at the end
+        :return: The number of imported shows along with the rows that failed
+        """
+        file_format = file_format or bulk_file_format(path)
+        report = ImportReport()
+        row_number = 0
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            for row_number, record in enumerate(read_bulk_records(file, file_format), start=1):
+                try:
+                    show = show_from_bulk_record(record)
+                except ValueError as error:
+                    report.errors.append((row_number, str(error)))
+                else:
+                    show.id = self.new_id()
+                    if show.ended and val.archive_ended_shows:
+                        self.archive.add(show)
+                        self.version += 1
+                    else:
+                        self.append(show)
+                    report.imported += 1
+                if progress is not None and row_number % val.bulk_progress_interval == 0:
+                    progress(row_number)
+        if progress is not None:
+            progress(row_number)
+
+        if report.imported:
+            self.check_all_releases(allow_notifications=False)
+            self.do_sorting(
+                weight_to_add=self.settings.weight_to_add if self.settings.move_recently_released_to_top else 0,
+                sort_by_upcoming=self.settings.sort_by_upcoming)
+            self.save()
+        return report
+
+    def export_shows(self, path: str, file_format: Union[str, None] = None, include_archive: bool = True,
+                     progress=None) -> int:
+        """
+        Writes every show to an export file, which can be read by import_shows.
+
+        :param path: Path of the file
+        :param file_format: "csv" or "jsonl". Inferred from the extension of path if None
+        :param include_archive: If True, archived shows are exported as well
+        :param progress: Called with the number of shows written so far every val.bulk_progress_interval shows,
+                         and once at the end
+        :return: The number of exported shows
+        """
+        file_format = file_format or bulk_file_format(path)
+        shows = self.all_shows() if include_archive else self.shows
+        count = 0
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            if file_format == "csv":
+                writer = csv.DictWriter(file, fieldnames=bulk_fields)
+                writer.writeheader()
+            for count, show in enumerate(shows, start=1):
+                record = show_as_bulk_record(show)
+                if file_format == "csv":
+                    record["links"] = show.get_link_string()
+                    writer.writerow(record)
+                else:
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                if progress is not None and count % val.bulk_progress_interval == 0:
+                    progress(count)
+        if progress is not None:
+            progress(count)
+        return count
+
+    def _reindex(self, show: Show):
+        """
+        Updates the id index after the id of a show has changed. Ids rarely change, so the old entry is simply searched
+        for.
+        """
+        for show_id, indexed in list(self._by_id.items()):
+            if indexed is show and show_id != show.id:
+                del self._by_id[show_id]
+        self._by_id[show.id] = show
+        if self._next_id is not None and show.id >= self._next_id:
+            self._next_id = show.id + 1
+
+    def _get_next_id(self) -> int:
+        """
+        Returns the id that the next new show will get. It is computed from every show, including the archived ones,
+        the first time it is needed, and afterwards kept up to date as shows are added.
+        """
+        if self._next_id is None:
+            archived_ids = (show.id for show in self.get_archive())
+            self._next_id = max(max(self._by_id, default=-1), max(archived_ids, default=-1)) + 1
+        return self._next_id
+
+    def new_id(self) -> int:
+        """
+        Hands out an id that no show has had since the shows were read.
         """
-        Finds the highest id held by a show in self.shows
+        new_id = self._get_next_id()
+        self._next_id = new_id + 1
+        return new_id
 
-        :return: The highest id in self.shows
+    def highest_id(self) -> int:
+        """
+        Returns the highest id held by a show in self.shows or the archive, or handed out by new_id since the shows
+        were read. -1 if there is none.
         """
-        if len(self.shows) == 0:
-            return -1
-        return max([int(show.id) for show in self.shows])
+        return self._get_next_id() - 1
 
     def from_id(self, target_id: Union[str, int]) -> Show:
         """
         Finds the show with the target id and returns it
 
         :param target_id: id of the show to be returned
-        :return: The show with an id equivalent to target_id
+        :return: The show with an id equivalent to target_id. Archived shows are included.
         """
         target_id = int(target_id)
-        for show in self.shows:
-            if show.id == target_id:
-                return show
-        raise KeyError
+        show = self._by_id.get(target_id)
+        if show is None:
+            self.get_archive()
+            show = self.archive.get(target_id)
+        if show is None:
+            raise KeyError(target_id)
+        return show
+
+
+def read_show(show_id: Union[str, int], store=None) -> Union[Show, None]:
+    """
+    Reads a single show without reading any of the other shows, for scripts that only touch one show. Archived shows
+    aren't included. Note that a running instance of the program overwrites changes made from a script to the shows
+    that it changes itself.
+
+    :param store: The store to read from. The store of val.show_storage_backend if None
+    :return: The show, or None if there is no show with that id
+    """
+    store = make_store() if store is None else store
+    row = store.read_row(show_id)
+    return None if row is None else Show.from_row(row)
+
+
+def open_link_by_id(show_id: Union[str, int], store=None) -> bool:
+    """
+    Opens the link of a single show in a browser. See read_show
+
+    :return: False if there is no show with that id
+    """
+    show = read_show(show_id, store)
+    if show is None:
+        return False
+    show.open_link()
+    return True
+
+
+def change_episode_by_id(show_id: Union[str, int], by: int = 1, store=None) -> bool:
+    """
+    Changes the episode of a single show. Where possible, the episode is changed within the save file itself, without
+    reading or writing any of the other shows. See read_show
+
+    :return: False if there is no show with that id
+    """
+    store = make_store() if store is None else store
+    row = store.read_row(show_id)
+    if row is None:
+        return False
+    store.update_field(show_id, COL_EP, str(int(row[COL_EP]) + by))
+    return True
 
 
 class Settings:
@@ -0,0 +1,124 @@
+# This file contains ShowColumns, which keeps the numeric fields of many shows in parallel arrays, one per field.
+# Operations on many shows at once, such as finding every show with a given color, are done on whole arrays with
+# built-in iterators and bitwise operations rather than by looking at one show object at a time.
+# See classes.ColumnarShow
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from operator import eq
+from typing import Any
+
+
+# The columns along with their array typecodes. "b" columns hold flags (0 or 1).
+column_types = {
+    "id": "q",
+    "ep": "q",
+    "season": "q",
+    "weight": "q",
+    "color": "q",
+    "is_hidden": "b",
+    "ended": "b",
+    "ep_season_relevant": "b",
+    "is_recently_released": "b",
+    "last_dismissal": "d",
+    # The parsed release info. Laid out like ReleaseInfo.get_fields
+    "release_type": "b",
+    "release_weekday": "b",
+    "release_day": "b",
+    "release_month": "b",
+    "release_year": "q",
+    "release_hour": "b",
+    "release_minute": "b",
+}
+release_columns = ("release_type", "release_weekday", "release_day", "release_month", "release_year", "release_hour",
+                   "release_minute")
+
+
+class ShowColumns:
+    """
+    Parallel arrays holding the numeric fields of shows. Each show has a row, i.e. an index into every array.
+    Rows of removed shows are reused by the next show that is added.
+    """
+
+    def __init__(self):
+        self.columns: dict[str, array] = {name: array(typecode) for name, typecode in column_types.items()}
+        self.live = bytearray()  # 1 for every row that belongs to a show, 0 for free rows
+        self.shows: list[Any] = []  # The show of every row. None for free rows
+        self._free_rows: list[int] = []
+
+    def __len__(self):
+        return len(self.live) - len(self._free_rows)
+
+    def allocate(self, show) -> int:
+        """
+        Returns a row for show. Every field of the row is 0.
+        """
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self.live[row] = 1
+            self.shows[row] = show
+            return row
+        for column in self.columns.values():
+            column.append(0)
+        self.live.append(1)
+        self.shows.append(show)
+        return len(self.live) - 1
+
+    def free(self, row: int):
+        """
+        Gives up a row, so that it can be used by another show.
+        """
+        for column in self.columns.values():
+            column[row] = 0
+        self.live[row] = 0
+        self.shows[row] = None
+        self._free_rows.append(row)
+
+    def mask(self, **conditions) -> bytes:
+        """
+        Returns a byte per row, which is 1 if the row belongs to a show whose fields equal the values of conditions.
+        For example, mask(color=2, is_hidden=False) is 1 for every row of a shown show with color 2.
+        """
+        return self._as_mask(self._mask_int(**conditions))
+
+    def _mask_int(self, **conditions) -> int:
+        """
+        Returns the mask as an integer, with one byte per row. Masks are combined with a single bitwise and this way.
+        """
+        mask = int.from_bytes(self.live, "little")
+        for name, value in conditions.items():
+            mask &= int.from_bytes(bytes(map(eq, self.columns[name], repeat(value))), "little")
+        return mask
+
+    def _as_mask(self, mask: int) -> bytes:
+        """
+        Returns a mask made by _mask_int as bytes.
+        """
+        return mask.to_bytes(len(self.live), "little")
+
+    def shows_where(self, **conditions) -> list:
+        """
+        Returns the shows whose fields equal the values of conditions, in the order of their rows.
+        """
+        return list(compress(self.shows, self.mask(**conditions)))
+
+    def count_where(self, **conditions) -> int:
+        """
+        Returns the number of shows whose fields equal the values of conditions.
+        """
+        return self._mask_int(**conditions).bit_count()
+
+    def count_visible(self) -> int:
+        """
+        Returns the number of shows that aren't hidden or are recently released.
+        """
+        live = int.from_bytes(self.live, "little")
+        hidden = int.from_bytes(self.columns["is_hidden"].tobytes(), "little")
+        recently_released = int.from_bytes(self.columns["is_recently_released"].tobytes(), "little")
+        return live.bit_count() - (live & hidden & ~recently_released).bit_count()
+
+    def count_by(self, name: str) -> Counter:
+        """
+        Returns how many shows have each value of a field.
+        """
+        return Counter(compress(self.columns[name], self.live))
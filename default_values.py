@@ -3,6 +3,9 @@
 
 settings_file = "settings.csv"
 show_file = "saved.csv"
+backup_directory = "backups"
+archive_file = "archive.csv"
+show_database_file = "saved.db"
 csv_delimiter = "\\"
 
 
@@ -57,8 +60,45 @@ hidden_button_color = "#888888"
 
 # The number of seconds in between a change being made to a show and the change being saved. Accepts floats
 delay_to_save_shows = 3
-# The maximum amount of seconds inbetween checking the release state of shows.
+# The maximum amount of seconds inbetween refreshing the time till release of the displayed shows. A refresh that would
+# change nothing on screen is skipped.
 update_release_vals_interval = 30
+# How shows are saved. "csv" rewrites the entire show file on every save. "journal" only appends the changes to a
+# journal next to the show file, which is folded into the show file once it grows larger than journal_compaction_size.
+# "sqlite" keeps shows in the database show_database_file, which is created from the show file the first time.
+show_storage_backend = "journal"
+# The size in bytes that the journal may reach before it is folded into the show file.
+journal_compaction_size = 256 * 1024
+# Whether shows are saved on a thread of their own, so that the window never waits for the disk.
+save_in_background = True
+# When saved shows are forced onto the disk. "none" leaves it to the operating system, "on-close" does it when the
+# main window closes and "always" does it after every save.
+fsync_policy = "on-close"
+# Whether the links and release info of shows are only decoded once they are needed, rather than when loading them.
+lazy_show_loading = True
+# Whether a binary snapshot of the shows is kept next to the show file. It is used to load shows faster on startup, as
+# long as the show file hasn't changed since the snapshot was made.
+use_show_snapshot = True
+# How many seconds there are between backups of the shows, how many backups are kept and how many of the newest backups
+# are kept uncompressed.
+backup_interval = 60 * 60
+backup_generations = 10
+uncompressed_backup_generations = 3
+# Whether shows that have ended are moved out of the main list and into the archive (archive_file). Archived shows
+# are only read from disk when needed, and can still be found by searching.
+archive_ended_shows = True
+# Whether the numeric fields of shows are kept in parallel arrays rather than in each show. This makes operations on
+# many shows at once (recoloring, reweighting, counting) faster, at the cost of slightly slower access to single shows
+columnar_show_store = False
+# How many rows are imported or exported between each call to the progress callback
+bulk_progress_interval = 1000
+# How many distinct release strings have their parsed values cached.
+release_parse_cache_size = 4096
+# How many rows of shows the main window may have before the height of a row has been measured. After that, there are
+# as many rows as fit in the window, and the rows are reused for other shows as the list is scrolled.
+initial_row_pool_size = 40
+# How many shows the list is scrolled by per step of the mouse wheel.
+scroll_step = 3
 # The mark next to shows that are recently released.
 # Examples: ✓ 📅 ★ ✰ ⚝ ⭐ ✨
 recently_released_string = "✨"
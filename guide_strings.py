@@ -26,10 +26,9 @@ Second of all, the episode and season counter can be adjusted simply by clicking
 on the counter itself. It will go up and down depending on where you click it.
 
 Third of all, in the top-left corner there is an arrow button. This button is one of those
-"Show more/less" buttons. This button exists for the sake of performance.
-When displaying hundreds of shows, the program can become slow (I mean, that is a lot of
-stuff to display, right?). How many shows are being displayed in show-less-mode is
-configurable in the settings.
+"Show more/less" buttons. Only as many shows as fit in the window are drawn at once, and
+the rest come into view as you scroll, so even hundreds of shows stay quick to display.
+How many shows are being displayed in show-less-mode is configurable in the settings.
 """
 
 settings_i =\
@@ -105,6 +104,10 @@ In other words, in order to 'dismiss' a show, a low weight should be entered in
 and the rest will automatically happen.
 
 Release Info and Ongoing is described in Release
+
+Shows that have ended are moved to the archive, which keeps them out of the main list. Archived shows
+can still be found by searching (magnifying glass in the top-left), where they have "-" instead of
+an index. Unchecking "Ended" in the show editor moves the show back into the main list.
 """
 
 release = \
@@ -0,0 +1,1176 @@
+# This file contains the classes responsible for putting shows on disk and getting them back again.
+# The classes in here only ever see shows as rows, i.e. lists of strings laid out like the columns of the save file,
+# so that they do not need to know anything about the Show class itself.
+import csv
+import io
+import os
+import sqlite3
+import struct
+import hashlib
+import mmap
+import gzip
+import shutil
+import tempfile
+import threading
+import traceback
+import datetime
+from typing import Union, Optional
+import default_values as val
+
+
+# The column layout of a row. This is the layout used by the save file.
+COL_ID = 0
+COL_TITLE = 1
+COL_EP = 2
+COL_SEASON = 3
+COL_LINKS = 4
+COL_WEIGHT = 5
+COL_COLOR = 6
+COL_EP_SEASON_RELEVANT = 7
+COL_RELEASE_STRING = 8
+COL_LAST_DISMISSAL = 9
+COL_IS_HIDDEN = 10
+COL_ENDED = 11
+NUM_OF_COLUMNS = 12
+
+# The binary snapshot. It starts with the magic bytes, the version and the key of the files it was made from.
+# Then follows the string table: the number of strings, the byte length of each and their utf-8 bytes.
+# Lastly, the number of shows and one fixed-width record per show.
+SNAPSHOT_MAGIC = b"WLSNAP"
+SNAPSHOT_VERSION = 4  # Increased whenever release strings are parsed differently, as the parsed fields are stored
+_snapshot_header = struct.Struct("<6sH16sI")  # magic, version, key, number of strings
+_snapshot_count = struct.Struct("<I")
+# id, ep, season, weight, color, last_dismissal, flags, title, links, release string (the last three are indices into
+# the string table), then the parsed release info: type, weekday, day, month, year, hour, minute and lastly the
+# release times worked out from it: previous release, next release, valid from, valid until
+_snapshot_record = struct.Struct("<qqqqqdBIIIbbbbhbbqqqq")
+SNAPSHOT_EP_SEASON_RELEVANT = 1
+SNAPSHOT_IS_HIDDEN = 2
+SNAPSHOT_ENDED = 4
+SNAPSHOT_RELEASE_PARSED = 8
+SNAPSHOT_RELEASE_TIMES = 16
+
+# The offset index of MappedShowsReader. The modification time and size of the save file, the number of entries
+# and then one (id, start, end) entry per row.
+_offset_index_header = struct.Struct("<qqI")
+_offset_index_entry = struct.Struct("<qqq")
+NUMERIC_COLUMNS = (COL_EP, COL_SEASON, COL_WEIGHT, COL_COLOR)
+
+# The record types used in the journal
+JOURNAL_ADD = "A"  # A whole row. If a row with the same id exists, it is replaced.
+JOURNAL_SET = "S"  # id, column, new value
+JOURNAL_DELETE = "D"  # id
+
+
+class RowChanges:
+    """
+    The difference between two versions of the show list, expressed in rows.
+    """
+
+    def __init__(self):
+        self.added: list[list[str]] = []
+        self.updated: list[tuple[str, int, str]] = []  # (id, column, new value)
+        self.removed: list[str] = []
+
+    def __bool__(self):
+        return bool(self.added or self.updated or self.removed)
+
+    def __len__(self):
+        return len(self.added) + len(self.updated) + len(self.removed)
+
+    def add_difference(self, old: list[str], row: list[str]):
+        """
+        Adds the fields in which row differs from old, the previous version of the same show.
+        """
+        show_id = row[COL_ID]
+        for column, value in enumerate(row):
+            if column >= len(old) or old[column] != value:
+                self.updated.append((show_id, column, value))
+
+    def merge(self, later: "RowChanges") -> "RowChanges":
+        """
+        Combines these changes with changes made afterwards into a single set of changes with the same outcome.
+        Changes to the same show are folded together, so each show appears at most once among added and removed.
+        """
+        # The row of every added show, the changed fields of every updated show, and None for every removed show
+        states: dict[str, Union[list[str], dict[int, str], None]] = {}
+        for changes in (self, later):
+            for row in changes.added:
+                states[row[COL_ID]] = list(row)
+            for show_id, column, value in changes.updated:
+                state = states.setdefault(show_id, {})
+                if state is not None:
+                    state[column] = value
+            for show_id in changes.removed:
+                states[show_id] = None
+
+        merged = RowChanges()
+        for show_id, state in states.items():
+            if state is None:
+                merged.removed.append(show_id)
+            elif isinstance(state, list):
+                merged.added.append(state)
+            else:
+                merged.updated.extend((show_id, column, value) for column, value in state.items())
+        return merged
+
+
+def fsync_file(path: str):
+    """
+    Makes sure that the contents of a file have actually been written to the disk.
+    """
+    if not os.path.isfile(path):
+        return
+    with open(path, "rb") as file:
+        os.fsync(file.fileno())
+
+
+def clone_file(source: str, destination: str, allow_link: bool):
+    """
+    Copies a file as cheaply as the file system allows. If allow_link is True, the file is hard linked, so no data is
+    copied at all. Otherwise, os.copy_file_range is used, which file systems supporting copy-on-write turn into a clone
+    of the file. If neither is possible, the file is copied normally.
+    An existing destination is removed first rather than written to, as it may be a hard link to a file that is in use.
+    """
+    if os.path.lexists(destination):
+        os.remove(destination)
+    if allow_link:
+        try:
+            os.link(source, destination)
+            return
+        except OSError:
+            pass
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        return
+    except (OSError, AttributeError):  # os.copy_file_range is not available everywhere
+        pass
+    shutil.copyfile(source, destination)
+
+
+def diff_rows(previous: dict[str, list[str]], current: list[list[str]]) -> RowChanges:
+    """
+    Compares two versions of the show list.
+
+    :param previous: The rows as they were last written to disk, keyed by id
+    :param current: The rows as they are now
+    :return: The changes needed to turn previous into current
+    """
+    changes = RowChanges()
+    seen = set()
+    for row in current:
+        show_id = row[COL_ID]
+        seen.add(show_id)
+        old = previous.get(show_id)
+        if old is None:
+            changes.added.append(row)
+            continue
+        changes.add_difference(old, row)
+    for show_id in previous:
+        if show_id not in seen:
+            changes.removed.append(show_id)
+    return changes
+
+
+def apply_journal_records(rows: dict[str, list[str]], records) -> dict[str, list[str]]:
+    """
+    Applies journal records to rows. Every record is absolute, meaning that applying the same record twice
+    has the same effect as applying it once. This is what makes it safe to replay a journal after a crash.
+
+    :param rows: The rows keyed by id. This dict is changed in place.
+    :param records: An iterable of journal records as returned by csv.reader
+    :return: rows
+    """
+    for record in records:
+        try:
+            kind = record[0]
+            if kind == JOURNAL_ADD:
+                rows[record[1 + COL_ID]] = record[1:]
+            elif kind == JOURNAL_SET:
+                row = rows.get(record[1])
+                if row is None:
+                    continue
+                column = int(record[2])
+                if column >= len(row):
+                    row.extend([""] * (column + 1 - len(row)))
+                row[column] = record[3]
+            elif kind == JOURNAL_DELETE:
+                rows.pop(record[1], None)
+        except (IndexError, ValueError):  # A damaged record is skipped rather than ruining the whole journal
+            continue
+    return rows
+
+
+def snapshot_key(paths) -> bytes:
+    """
+    Returns a key identifying the current contents of some files. It is made from the modification time, size and
+    contents of every file, so it changes whenever any of the files changes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            digest.update(f"{path}:missing;".encode())
+            continue
+        digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.digest()
+
+
+def write_snapshot(path: str, key: bytes, records):
+    """
+    Writes a binary snapshot of shows.
+
+    :param path: Where to write the snapshot
+    :param key: The key of the files that the records match, see snapshot_key
+    :param records: Tuples of (id, title, ep, season, link string, weight, color, ep_season_relevant, release string,
+    last_dismissal, is_hidden, ended, release fields, release times), where release fields is None if the release
+    string hasn't been parsed or a tuple of (type, weekday, day, month, year, hour, minute) and release times is None or
+    a tuple of (previous release, next release, valid from, valid until), see classes.ReleaseInfo.get_release_times
+    """
+    strings: dict[str, int] = {}  # Every distinct string is only stored once
+    packed = []
+    for (show_id, title, ep, season, link_string, weight, color, ep_season_relevant, release_string,
+         last_dismissal, is_hidden, ended, release_fields, release_times) in records:
+        flags = (SNAPSHOT_EP_SEASON_RELEVANT * ep_season_relevant | SNAPSHOT_IS_HIDDEN * is_hidden
+                 | SNAPSHOT_ENDED * ended | SNAPSHOT_RELEASE_PARSED * (release_fields is not None)
+                 | SNAPSHOT_RELEASE_TIMES * (release_times is not None))
+        packed.append(_snapshot_record.pack(show_id, ep, season, weight, color, last_dismissal, flags,
+                                            strings.setdefault(title, len(strings)),
+                                            strings.setdefault(link_string, len(strings)),
+                                            strings.setdefault(release_string, len(strings)),
+                                            *(release_fields or (0, 0, 0, 0, 0, 0, 0)),
+                                            *(release_times or (0, 0, 0, 0))))
+
+    encoded = [string.encode("utf-8") for string in strings]
+    temppath = f"{path}.temp"
+    with open(temppath, "wb") as file:
+        file.write(_snapshot_header.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, key, len(encoded)))
+        file.write(struct.pack(f"<{len(encoded)}I", *(len(string) for string in encoded)))
+        file.write(b"".join(encoded))
+        file.write(_snapshot_count.pack(len(packed)))
+        file.write(b"".join(packed))
+    os.replace(temppath, path)
+
+
+def read_snapshot(path: str, key: bytes) -> Optional[list[tuple]]:
+    """
+    Reads a binary snapshot of shows written by write_snapshot.
+
+    :return: The records, or None if the snapshot is missing, damaged or doesn't match key
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, snapshot_key_, num_of_strings = _snapshot_header.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or snapshot_key_ != key:
+            return None
+        offset = _snapshot_header.size
+        lengths = struct.unpack_from(f"<{num_of_strings}I", data, offset)
+        offset += 4 * num_of_strings
+        strings = []
+        for length in lengths:
+            strings.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+        num_of_records, = _snapshot_count.unpack_from(data, offset)
+        offset += _snapshot_count.size
+
+        records = []
+        for (show_id, ep, season, weight, color, last_dismissal, flags, title, link_string, release_string,
+             *release) in _snapshot_record.iter_unpack(data[offset:offset + num_of_records * _snapshot_record.size]):
+            records.append((show_id, strings[title], ep, season, strings[link_string], weight, color,
+                            bool(flags & SNAPSHOT_EP_SEASON_RELEVANT), strings[release_string], last_dismissal,
+                            bool(flags & SNAPSHOT_IS_HIDDEN), bool(flags & SNAPSHOT_ENDED),
+                            tuple(release[:7]) if flags & SNAPSHOT_RELEASE_PARSED else None,
+                            tuple(release[7:]) if flags & SNAPSHOT_RELEASE_TIMES else None))
+        if len(records) != num_of_records:
+            return None
+        return records
+    except (OSError, struct.error, IndexError, UnicodeDecodeError):
+        return None
+
+
+class CsvStore:
+    """
+    Stores all shows in a single csv file, which is completely rewritten whenever something changes.
+    The new file is written next to the old one and then moved over it, so the save file is never half written.
+    """
+
+    writes_all_rows = True  # Whether .save needs every row, or only the changes
+
+    def __init__(self, savefile=val.show_file, delimiter=val.csv_delimiter):
+        self.savefile = savefile
+        self.delimiter = delimiter
+
+        self.ensure_file_exists()
+
+    def ensure_file_exists(self):
+        """
+        Checks if the save file exists. If not, the file is created.
+        """
+        if not os.path.isfile(self.savefile):
+            with open(self.savefile, "w"):
+                pass
+
+    def read_snapshot(self) -> dict[str, list[str]]:
+        """
+        Reads the save file and returns its rows keyed by id.
+        """
+        rows = {}
+        with open(self.savefile, newline="", encoding="utf-8") as csvfile:
+            reader = csv.reader(csvfile, delimiter=self.delimiter, quotechar="|")
+            for row in reader:
+                if row:
+                    rows[row[COL_ID]] = row
+        return rows
+
+    def read_rows(self) -> list[list[str]]:
+        """
+        Returns every stored row.
+        """
+        return list(self.read_snapshot().values())
+
+    def source_files(self) -> Optional[list[str]]:
+        """
+        Returns the files that the rows are read from. A binary snapshot of the shows is valid for as long as these
+        files are unchanged.
+        """
+        return [self.savefile]
+
+    def write_rows(self, rows):
+        """
+        Writes all rows to a temporary file, which then replaces the save file. As the save file is replaced rather
+        than changed, hard links to the old save file (i.e. backups) keep the old contents.
+        """
+        now = datetime.datetime.now()
+        tempsavefile = f"{self.savefile}.temp.{now.year}.{now.month}.{now.day}.{now.hour}.{now.minute}.{now.second}"
+        with open(tempsavefile, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile, delimiter=self.delimiter, quotechar="|")
+            writer.writerows(rows)
+        os.replace(tempsavefile, self.savefile)
+
+    def save(self, rows: list[list[str]], changes: RowChanges):
+        """
+        Persists the current rows. This store has no use for the changes, it always writes everything.
+        """
+        self.write_rows(rows)
+
+    def mapped_reader(self) -> "MappedShowsReader":
+        """
+        Returns a reader of single shows from the save file. See MappedShowsReader
+        """
+        return MappedShowsReader(self.savefile, self.delimiter, journal_files=())
+
+    def read_row(self, show_id: Union[str, int]) -> Optional[list[str]]:
+        """
+        Returns a single row by id, or None if no show has that id. Only that row is decoded.
+        """
+        return self.mapped_reader().read_row(show_id)
+
+    def update_field(self, show_id: Union[str, int], column: int, value: str):
+        """
+        Changes a single field of a stored show, without reading the other shows if possible. Numeric fields are
+        changed within the save file itself when the new value is as wide as the old one. Otherwise, the change is
+        saved like any other.
+        """
+        if column in NUMERIC_COLUMNS and self.mapped_reader().set_numeric_field(show_id, column, int(value)):
+            return
+        changes = RowChanges()
+        changes.updated.append((str(show_id), column, value))
+        rows = []
+        if self.writes_all_rows:
+            rows = self.read_rows()
+            for row in rows:
+                if row[COL_ID] == str(show_id):
+                    row[column] = value
+        self.save(rows, changes)
+
+    def sync(self):
+        """
+        Makes sure everything written so far has reached the disk.
+        """
+        fsync_file(self.savefile)
+
+    def backup_to(self, directory: str):
+        """
+        Puts a copy of everything stored into directory. The save file is only ever replaced, never changed, so
+        it can be hard linked rather than copied.
+        """
+        clone_file(self.savefile, os.path.join(directory, os.path.basename(self.savefile)), allow_link=True)
+
+    def close(self):
+        """
+        Finishes whatever the store is doing in the background.
+        """
+        pass
+
+
+class JournaledCsvStore(CsvStore):
+    """
+    Stores shows in the save file (the snapshot) and a journal next to it. A save only appends the fields that changed
+    to the journal. On startup the journal is replayed on top of the snapshot.
+
+    Once the journal grows beyond compaction_size bytes, it is folded into a new snapshot on a background thread.
+    While this happens, the journal is renamed to .compacting and new records go into a fresh journal. Because every
+    record is absolute, a crash at any point during compaction or while appending is recovered by replaying
+    whatever journals are left over - and a half written record at the end of a journal is ignored.
+    """
+
+    writes_all_rows = False
+
+    def __init__(self, savefile=val.show_file, delimiter=val.csv_delimiter,
+                 compaction_size=val.journal_compaction_size):
+        self.journal_file = f"{savefile}.journal"
+        self.compacting_file = f"{savefile}.journal.compacting"
+        self.compaction_size = compaction_size
+        self._compaction_thread: Optional[threading.Thread] = None
+        super().__init__(savefile, delimiter)
+
+    def mapped_reader(self) -> "MappedShowsReader":
+        """
+        Returns a reader of single shows from the save file and the journals. See MappedShowsReader
+        """
+        return MappedShowsReader(self.savefile, self.delimiter)
+
+    def read_journal(self, path) -> list[list[str]]:
+        """
+        Reads the records of a journal. If the last record was only partially written, it is dropped.
+        """
+        if not os.path.isfile(path):
+            return []
+        with open(path, newline="", encoding="utf-8") as journal:
+            text = journal.read()
+        text = text[:text.rfind("\n") + 1]
+        return [record for record in csv.reader(io.StringIO(text, newline=""),
+                                                delimiter=self.delimiter, quotechar="|") if record]
+
+    def read_rows(self) -> list[list[str]]:
+        """
+        Returns the rows of the snapshot with every left over journal replayed on top.
+        """
+        self.wait_for_compaction()
+        rows = self.read_snapshot()
+        apply_journal_records(rows, self.read_journal(self.compacting_file))
+        apply_journal_records(rows, self.read_journal(self.journal_file))
+        if os.path.isfile(self.compacting_file):  # A compaction was interrupted. Finish it before doing anything else
+            self.compact()
+        return list(rows.values())
+
+    def save(self, rows: list[list[str]], changes: RowChanges):
+        """
+        Appends the changes to the journal and starts compacting it if it has grown too large.
+        """
+        if not changes:
+            return
+        buffer = io.StringIO(newline="")
+        writer = csv.writer(buffer, delimiter=self.delimiter, quotechar="|")
+        writer.writerows([JOURNAL_ADD, *row] for row in changes.added)
+        writer.writerows([JOURNAL_SET, show_id, column, value] for show_id, column, value in changes.updated)
+        writer.writerows([JOURNAL_DELETE, show_id] for show_id in changes.removed)
+        with open(self.journal_file, "a", newline="", encoding="utf-8") as journal:
+            journal.write(buffer.getvalue())
+            size = journal.tell()
+
+        if size > self.compaction_size:
+            self.start_compaction()
+
+    def start_compaction(self):
+        """
+        Moves the journal out of the way and folds it into the snapshot on a background thread.
+        """
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        if os.path.isfile(self.compacting_file):
+            return
+        os.replace(self.journal_file, self.compacting_file)
+        self._compaction_thread = threading.Thread(target=self.compact, name="journal-compaction")
+        self._compaction_thread.start()
+
+    def compact(self):
+        """
+        Writes a new snapshot consisting of the old snapshot and the .compacting journal. Thereafter, the .compacting
+        journal is removed.
+        """
+        rows = self.read_snapshot()
+        apply_journal_records(rows, self.read_journal(self.compacting_file))
+        self.write_rows(rows.values())
+        os.remove(self.compacting_file)
+
+    def source_files(self) -> Optional[list[str]]:
+        """
+        Returns the files that the rows are read from.
+        """
+        return [self.savefile, self.compacting_file, self.journal_file]
+
+    def sync(self):
+        """
+        Makes sure everything written so far has reached the disk.
+        """
+        fsync_file(self.savefile)
+        fsync_file(self.journal_file)
+
+    def backup_to(self, directory: str):
+        """
+        Puts a copy of the save file and the journals into directory. The journal is appended to, so it must be
+        copied rather than hard linked.
+        """
+        self.wait_for_compaction()
+        super().backup_to(directory)
+        for path in (self.compacting_file, self.journal_file):
+            if os.path.isfile(path):
+                clone_file(path, os.path.join(directory, os.path.basename(path)), allow_link=False)
+
+    def wait_for_compaction(self):
+        """
+        Blocks until a running compaction is done.
+        """
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+            self._compaction_thread = None
+
+    def close(self):
+        """
+        Waits for a running compaction to finish.
+        """
+        self.wait_for_compaction()
+
+
+def field_spans(line: bytes, delimiter: bytes, quotechar: bytes = b"|") -> list[tuple[int, int]]:
+    """
+    Finds where each field of a csv line starts and ends, including any quotes around it.
+
+    :param line: A single line of a csv file, without its line terminator
+    :param delimiter: The delimiter as a single byte
+    :param quotechar: The quote character as a single byte
+    :return: A (start, end) tuple for each field
+    """
+    spans = []
+    start = 0
+    length = len(line)
+    while start <= length:
+        end = start
+        if line[start:start + 1] == quotechar:  # Quoted, so look for the closing quote that isn't doubled
+            end += 1
+            while end < length:
+                if line[end:end + 1] == quotechar:
+                    if line[end + 1:end + 2] == quotechar:
+                        end += 2
+                        continue
+                    end += 1
+                    break
+                end += 1
+        end = line.find(delimiter, end)
+        if end == -1:
+            end = length
+        spans.append((start, end))
+        start = end + 1
+    return spans
+
+
+class MappedShowsReader:
+    """
+    Reads single shows from the save file without parsing the rest of it. The save file is memory-mapped, and an index
+    of where each show's row starts and ends is kept in a file next to it, so that only the requested row is decoded.
+
+    Rows in the journal take precedence over rows in the save file, so the rows returned are the same as those
+    the store would return.
+
+    Numeric fields can be changed in place, but only if the new value takes up exactly as many characters as the old.
+    Note that a running program will overwrite such changes, if it saves the same show afterwards.
+    """
+
+    def __init__(self, savefile=val.show_file, delimiter=val.csv_delimiter, journal_files=None):
+        self.savefile = savefile
+        self.delimiter = delimiter
+        self.index_file = f"{savefile}.idx"
+        # The journals applied on top of the save file, oldest first. Those of JournaledCsvStore if None
+        if journal_files is None:
+            journal_files = (f"{savefile}.journal.compacting", f"{savefile}.journal")
+        self.journal_files = journal_files
+        self.offsets: dict[int, tuple[int, int]] = {}
+        self.load_index()
+
+    def file_key(self) -> tuple[int, int]:
+        """
+        Returns the modification time and size of the save file, which the index is only valid for.
+        """
+        stat = os.stat(self.savefile)
+        return stat.st_mtime_ns, stat.st_size
+
+    def load_index(self):
+        """
+        Loads the offset index from disk, or builds it anew if it doesn't match the save file.
+        """
+        try:
+            with open(self.index_file, "rb") as file:
+                data = file.read()
+            mtime, size, num_of_entries = _offset_index_header.unpack_from(data, 0)
+            if (mtime, size) == self.file_key():
+                entries_end = _offset_index_header.size + num_of_entries * _offset_index_entry.size
+                entries = _offset_index_entry.iter_unpack(data[_offset_index_header.size:entries_end])
+                self.offsets = {show_id: (start, end) for show_id, start, end in entries}
+                if len(self.offsets) == num_of_entries:
+                    return
+        except (OSError, struct.error):
+            pass
+        self.build_index()
+
+    def build_index(self):
+        """
+        Scans the save file for the start and end of every row and saves the result to the index file.
+        """
+        self.offsets = {}
+        delimiter = self.delimiter.encode()
+        with open(self.savefile, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                data = b""
+            else:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            start = 0
+            length = len(data)
+            while start < length:
+                end = data.find(b"\n", start)
+                if end == -1:
+                    end = length
+                line_end = end - 1 if end > start and data[end - 1:end] == b"\r" else end
+                field_end = data.find(delimiter, start, line_end)
+                try:
+                    self.offsets[int(data[start:field_end if field_end != -1 else line_end])] = (start, line_end)
+                except ValueError:  # Empty or damaged line
+                    pass
+                start = end + 1
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self.save_index()
+
+    def save_index(self):
+        """
+        Writes the offset index to disk.
+        """
+        try:
+            with open(self.index_file, "wb") as file:
+                file.write(_offset_index_header.pack(*self.file_key(), len(self.offsets)))
+                file.write(b"".join(_offset_index_entry.pack(show_id, start, end)
+                                    for show_id, (start, end) in self.offsets.items()))
+        except OSError:  # The index is only a cache
+            pass
+
+    def journal_records(self, show_id: str) -> list[list[str]]:
+        """
+        Returns every journal record concerning a single show.
+        """
+        records = []
+        for path in self.journal_files:
+            if not os.path.isfile(path):
+                continue
+            with open(path, newline="", encoding="utf-8") as journal:
+                text = journal.read()
+            text = text[:text.rfind("\n") + 1]
+            for record in csv.reader(io.StringIO(text, newline=""), delimiter=self.delimiter, quotechar="|"):
+                if len(record) > 1 and record[1] == show_id:
+                    records.append(record)
+        return records
+
+    def read_line(self, show_id: int) -> Optional[bytes]:
+        """
+        Returns the raw line of a show in the save file.
+        """
+        if show_id not in self.offsets:
+            return None
+        start, end = self.offsets[show_id]
+        with open(self.savefile, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return data[start:end]
+
+    def read_row(self, show_id: Union[str, int]) -> Optional[list[str]]:
+        """
+        Returns the row of a single show, or None if there is no show with that id.
+        """
+        show_id = int(show_id)
+        rows = {}
+        line = self.read_line(show_id)
+        if line is not None:
+            row = next(csv.reader([line.decode("utf-8")], delimiter=self.delimiter, quotechar="|"))
+            rows[row[COL_ID]] = row
+        apply_journal_records(rows, self.journal_records(str(show_id)))
+        return rows.get(str(show_id))
+
+    def set_numeric_field(self, show_id: Union[str, int], column: int, value: int) -> bool:
+        """
+        Changes a numeric field of a show directly within the save file.
+        This is only possible if the new value has as many characters as the old one, the show is in the save file,
+        the journal has no changes to the show and the save file isn't hard linked elsewhere (i.e. a backup).
+
+        :return: True if the field was changed, False if it wasn't possible.
+        """
+        show_id = int(show_id)
+        if column not in NUMERIC_COLUMNS or show_id not in self.offsets or self.journal_records(str(show_id)):
+            return False
+        if os.stat(self.savefile).st_nlink > 1:
+            return False
+
+        start, end = self.offsets[show_id]
+        new = str(int(value)).encode()
+        with open(self.savefile, "r+b") as file, mmap.mmap(file.fileno(), 0) as data:
+            spans = field_spans(data[start:end], self.delimiter.encode())
+            if column >= len(spans):
+                return False
+            field_start, field_end = spans[column]
+            if field_end - field_start != len(new):
+                return False
+            data[start + field_start:start + field_end] = new
+            data.flush()
+        self.save_index()  # The offsets are unchanged, but the modification time of the save file isn't
+        return True
+
+
+class SQLiteStore:
+    """
+    Stores shows in an sqlite database with one row per show. A save only touches the shows that changed, and does
+    so within a single transaction. Lookups on id, weight, color and is_hidden are indexed.
+
+    If the database doesn't exist yet, but the csv save file does, then the csv save file (and its journal) is
+    imported once. The csv save file itself is left untouched.
+    """
+
+    # (column name, sqlite type) in the order of the columns of a row
+    columns = (("id", "INTEGER PRIMARY KEY"),
+               ("title", "TEXT"),
+               ("ep", "INTEGER"),
+               ("season", "INTEGER"),
+               ("links", "TEXT"),
+               ("weight", "INTEGER"),
+               ("color", "INTEGER"),
+               ("ep_season_relevant", "INTEGER"),
+               ("release_string", "TEXT"),
+               ("last_dismissal", "REAL"),
+               ("is_hidden", "INTEGER"),
+               ("ended", "INTEGER"))
+    bool_columns = (COL_EP_SEASON_RELEVANT, COL_IS_HIDDEN, COL_ENDED)
+    writes_all_rows = False
+    indexed_columns = ("weight", "color", "is_hidden")
+
+    def __init__(self, database=val.show_database_file, savefile=val.show_file, delimiter=val.csv_delimiter):
+        self.database = database
+        self.savefile = savefile
+        self.delimiter = delimiter
+
+        if not os.path.isfile(self.database) and os.path.isfile(self.savefile):
+            self.migrate_from_csv()
+        # The connection may be used from another thread than the one that created it,
+        # though never from two at the same time.
+        self.connection = sqlite3.connect(self.database, check_same_thread=False)
+        self.create_tables(self.connection)
+
+    def create_tables(self, connection: sqlite3.Connection):
+        """
+        Creates the table and its indices if they don't exist.
+        """
+        with connection:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS shows "
+                               f"({', '.join(f'{name} {kind}' for name, kind in self.columns)})")
+            for column in self.indexed_columns:
+                connection.execute(f"CREATE INDEX IF NOT EXISTS shows_{column} ON shows ({column})")
+
+    def migrate_from_csv(self):
+        """
+        Copies every show from the csv save file into a new database. The database is made under another name and
+        only moved into place once every show has been copied. Should the migration fail, there is no database, so
+        the migration is simply tried again the next time.
+        """
+        rows = JournaledCsvStore(self.savefile, self.delimiter).read_rows()
+        temppath = f"{self.database}.migrating"
+        if os.path.isfile(temppath):  # Left behind by a migration that failed
+            os.remove(temppath)
+        connection = sqlite3.connect(temppath)
+        try:
+            self.create_tables(connection)
+            with connection:
+                connection.executemany(self.insert_statement(), (self.to_database(row) for row in rows))
+        finally:
+            connection.close()
+        os.replace(temppath, self.database)
+
+    def to_database(self, row: list[str]) -> list:
+        """
+        Converts a row to the values stored in the database. Missing columns are given their default value.
+        """
+        values = list(row[:NUM_OF_COLUMNS])
+        if len(values) < NUM_OF_COLUMNS:
+            values += ["False", "", "0", "False", "False"][len(values) - COL_EP_SEASON_RELEVANT:]
+        for column in self.bool_columns:
+            values[column] = self.to_database_value(column, values[column])
+        return values
+
+    def from_database(self, values) -> list[str]:
+        """
+        Converts the values stored in the database back into a row.
+        """
+        row = [str(value) for value in values]
+        for column in self.bool_columns:
+            row[column] = str(bool(values[column]))
+        return row
+
+    def to_database_value(self, column: int, value: str):
+        """
+        Converts a single field of a row to the value stored in the database.
+        """
+        if column in self.bool_columns:
+            return int(value == "True")
+        return value
+
+    def insert_statement(self) -> str:
+        """
+        Returns the statement used to insert a whole row. A row with the same id is replaced.
+        """
+        return f"INSERT OR REPLACE INTO shows VALUES ({', '.join('?' * NUM_OF_COLUMNS)})"
+
+    def read_rows(self) -> list[list[str]]:
+        """
+        Returns every stored row.
+        """
+        cursor = self.connection.execute(f"SELECT {', '.join(name for name, _ in self.columns)} FROM shows")
+        return [self.from_database(values) for values in cursor]
+
+    def source_files(self) -> Optional[list[str]]:
+        """
+        The database is quick enough to load on its own, so no binary snapshot is made of it.
+        """
+        return None
+
+    def read_row(self, show_id: Union[str, int]) -> Optional[list[str]]:
+        """
+        Returns a single row by id, or None if no show has that id.
+        """
+        values = self.connection.execute(f"SELECT {', '.join(name for name, _ in self.columns)} FROM shows "
+                                         f"WHERE id = ?", (int(show_id),)).fetchone()
+        return None if values is None else self.from_database(values)
+
+    def update_field(self, show_id: Union[str, int], column: int, value: str):
+        """
+        Changes a single field of a stored show.
+        """
+        changes = RowChanges()
+        changes.updated.append((str(show_id), column, value))
+        self.save([], changes)
+
+    def save(self, rows: list[list[str]], changes: RowChanges):
+        """
+        Writes the changes within a single transaction. Every changed show is a single UPDATE.
+        """
+        if not changes:
+            return
+        updates: dict[str, dict[int, str]] = {}
+        for show_id, column, value in changes.updated:
+            updates.setdefault(show_id, {})[column] = value
+
+        with self.connection:
+            self.connection.executemany(self.insert_statement(), (self.to_database(row) for row in changes.added))
+            for show_id, fields in updates.items():
+                assignments = ", ".join(f"{self.columns[column][0]} = ?" for column in fields)
+                self.connection.execute(f"UPDATE shows SET {assignments} WHERE id = ?",
+                                        [*(self.to_database_value(column, value) for column, value in fields.items()),
+                                         int(show_id)])
+            self.connection.executemany("DELETE FROM shows WHERE id = ?",
+                                        ((int(show_id),) for show_id in changes.removed))
+
+    def sync(self):
+        """
+        Makes sure everything written so far has reached the disk.
+        """
+        fsync_file(self.database)
+
+    def backup_to(self, directory: str):
+        """
+        Puts a consistent copy of the database into directory.
+        """
+        destination = sqlite3.connect(os.path.join(directory, os.path.basename(self.database)))
+        self.connection.backup(destination)
+        destination.close()
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        """
+        self.connection.close()
+
+
+class ShowsWriter:
+    """
+    Saves shows on a thread of its own, so that the thread running the GUI never has to wait for the disk.
+
+    Snapshots of the shows are handed over with .submit. If the thread is still busy writing when more snapshots
+    arrive, these are combined into a single write.
+
+    fsync_policy decides when the written data is forced onto the disk: "none" leaves it to the operating system,
+    "on-close" does it once the writer is flushed or closed and "always" does it after every write.
+
+    If backups is given, a generation of backups is taken after a write whenever one is due.
+    """
+
+    def __init__(self, store, fsync_policy: str = val.fsync_policy, backups: "BackupManager" = None):
+        self.store = store
+        self.fsync_policy = fsync_policy
+        self.backups = backups
+
+        self._condition = threading.Condition()
+        self._pending_rows = None
+        self._pending_changes: Optional[RowChanges] = None
+        self._writing = False
+        self._failed = False
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="shows-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, rows: tuple, changes: RowChanges):
+        """
+        Hands a snapshot to the writer thread. Returns immediately.
+
+        :param rows: Every row, if the store needs them. The rows must not be changed afterwards.
+        :param changes: The changes since the previous snapshot
+        """
+        with self._condition:
+            if self._pending_changes is None:
+                self._pending_changes = changes
+            else:
+                self._pending_changes = self._pending_changes.merge(changes)
+            self._pending_rows = rows
+            self._failed = False
+            self._condition.notify_all()
+
+    def _run(self):
+        """
+        The loop of the writer thread.
+        """
+        while True:
+            with self._condition:
+                while (self._pending_changes is None or self._failed) and not self._closing:
+                    self._condition.wait()
+                if self._pending_changes is None or self._failed:  # Closing, and nothing (more) can be written
+                    return
+                rows, changes = self._pending_rows, self._pending_changes
+                self._pending_rows, self._pending_changes = None, None
+                self._writing = True
+
+            try:
+                self.store.save(rows, changes)
+                if self.fsync_policy == "always":
+                    self.store.sync()
+                if self.backups is not None:
+                    self.backups.maybe_backup()
+                failed = False
+            except (OSError, sqlite3.Error):
+                traceback.print_exc()
+                failed = True
+
+            with self._condition:
+                self._writing = False
+                if failed:  # Put the snapshot back, it will be retried along with the next one
+                    if self._pending_changes is not None:
+                        changes = changes.merge(self._pending_changes)
+                        rows = self._pending_rows
+                    self._pending_rows, self._pending_changes = rows, changes
+                    self._failed = True
+                self._condition.notify_all()
+
+    def has_failed(self) -> bool:
+        """
+        Returns True if the last attempt at writing failed, meaning that the disk is not up-to-date.
+        """
+        with self._condition:
+            return self._failed
+
+    def flush(self):
+        """
+        Blocks until every submitted snapshot has been written (or a write has failed).
+        """
+        with self._condition:
+            while (self._pending_changes is not None and not self._failed) or self._writing:
+                self._condition.wait()
+        if self.fsync_policy != "none":
+            self.store.sync()
+
+    def close(self):
+        """
+        Writes whatever is left, stops the thread and closes the store.
+        """
+        with self._condition:
+            self._failed = False  # Give a failed write one last try
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self.fsync_policy != "none":
+            self.store.sync()
+        self.store.close()
+
+
+class BackupManager:
+    """
+    Keeps generations of backups of a store. Each generation is a directory within backup_directory, named after the
+    time it was taken. If several generations are taken within the same second, the later ones are given a counter,
+    as in 2024-01-31_20-00-00.1, so that every generation has a directory of its own. A new generation is taken once
+    the newest is more than interval seconds old. Only the newest num_of_generations generations are kept, and all but
+    the newest keep_uncompressed generations are compressed.
+    """
+
+    generation_name_format = "%Y-%m-%d_%H-%M-%S"
+
+    def __init__(self, store, backup_directory=val.backup_directory, interval=val.backup_interval,
+                 num_of_generations=val.backup_generations, keep_uncompressed=val.uncompressed_backup_generations):
+        self.store = store
+        self.backup_directory = backup_directory
+        self.interval = interval
+        self.num_of_generations = num_of_generations
+        self.keep_uncompressed = keep_uncompressed
+
+    def generations(self) -> list[str]:
+        """
+        Returns the paths of all generations, the newest first.
+        """
+        if not os.path.isdir(self.backup_directory):
+            return []
+        names = {}
+        for name in os.listdir(self.backup_directory):
+            try:
+                names[name] = self.parse_generation_name(name)
+            except ValueError:
+                continue
+        return [os.path.join(self.backup_directory, name) for name in sorted(names, key=names.get, reverse=True)]
+
+    def parse_generation_name(self, name: str) -> tuple[datetime.datetime, int]:
+        """
+        Returns when a generation was taken along with its counter, which is 0 for the first generation of a second.
+        Raises ValueError if name isn't the name of a generation.
+        """
+        time_taken, _, counter = name.partition(".")
+        if counter and not counter.isdigit():
+            raise ValueError(f"{name} isn't the name of a generation")
+        return datetime.datetime.strptime(time_taken, self.generation_name_format), int(counter or 0)
+
+    def generation_time(self, generation: str) -> datetime.datetime:
+        """
+        Returns when a generation was taken.
+        """
+        return self.parse_generation_name(os.path.basename(generation))[0]
+
+    def is_due(self, now: datetime.datetime = None) -> bool:
+        """
+        Returns True if the newest generation is older than the interval.
+        """
+        now = datetime.datetime.now() if now is None else now
+        generations = self.generations()
+        return not generations or (now - self.generation_time(generations[0])).total_seconds() >= self.interval
+
+    def maybe_backup(self):
+        """
+        Takes a new generation if one is due.
+        """
+        if self.num_of_generations > 0 and self.is_due():
+            self.backup()
+
+    def backup(self) -> str:
+        """
+        Takes a new generation, then compresses and removes old generations.
+
+        :return: The path of the new generation
+        """
+        os.makedirs(self.backup_directory, exist_ok=True)
+        name = datetime.datetime.now().strftime(self.generation_name_format)
+        generation = os.path.join(self.backup_directory, name)
+        counter = 0
+        while True:
+            try:
+                os.mkdir(generation)
+                break
+            except FileExistsError:  # A generation has already been taken within this second
+                counter += 1
+                generation = os.path.join(self.backup_directory, f"{name}.{counter}")
+        self.store.backup_to(generation)
+
+        generations = self.generations()
+        for old in generations[self.num_of_generations:]:
+            shutil.rmtree(old, ignore_errors=True)
+        for old in generations[self.keep_uncompressed:self.num_of_generations]:
+            self.compress(old)
+        return generation
+
+    @staticmethod
+    def compress(generation: str):
+        """
+        Compresses every file of a generation that hasn't been compressed yet.
+        """
+        for name in os.listdir(generation):
+            if name.endswith(".gz"):
+                continue
+            path = os.path.join(generation, name)
+            with open(path, "rb") as src, gzip.open(f"{path}.gz.temp", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(f"{path}.gz.temp", f"{path}.gz")
+            os.remove(path)
+
+    def read_generation(self, generation: str) -> list[list[str]]:
+        """
+        Returns the rows stored within a generation.
+        """
+        contents = {}
+        for name in os.listdir(generation):
+            opener = gzip.open if name.endswith(".gz") else open
+            with opener(os.path.join(generation, name), "rb") as file:
+                contents[name.removesuffix(".gz")] = file.read()
+
+        if isinstance(self.store, SQLiteStore):
+            data = contents.get(os.path.basename(self.store.database))
+            if data is None:
+                return []
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "backup.db")
+                with open(path, "wb") as file:
+                    file.write(data)
+                connection = sqlite3.connect(path)
+                values = connection.execute(
+                    f"SELECT {', '.join(name for name, _ in SQLiteStore.columns)} FROM shows").fetchall()
+                connection.close()
+            return [self.store.from_database(row) for row in values]
+
+        def records(name):
+            text = contents.get(name, b"").decode("utf-8")
+            text = text[:text.rfind("\n") + 1]
+            return [record for record in csv.reader(io.StringIO(text, newline=""), delimiter=self.store.delimiter,
+                                                    quotechar="|") if record]
+
+        savefile = os.path.basename(self.store.savefile)
+        rows = {row[COL_ID]: row for row in records(savefile)}
+        apply_journal_records(rows, records(f"{savefile}.journal.compacting"))
+        apply_journal_records(rows, records(f"{savefile}.journal"))
+        return list(rows.values())
+
+    def list_generations(self) -> list[tuple[str, datetime.datetime, int]]:
+        """
+        Returns a (path, time taken, number of shows) tuple for every generation, the newest first.
+        """
+        return [(generation, self.generation_time(generation), len(self.read_generation(generation)))
+                for generation in self.generations()]
+
+
+def make_store(savefile: str = val.show_file, delimiter: str = val.csv_delimiter,
+               backend: str = val.show_storage_backend) -> Union[CsvStore, JournaledCsvStore, SQLiteStore]:
+    """
+    Creates the store used for saving shows according to backend.
+
+    :param savefile: The path of the save file
+    :param delimiter: The delimiter used within csv files
+    :param backend: "csv" to rewrite the whole file on every save, "journal" to append changes to a journal and
+    "sqlite" to keep shows in the database val.show_database_file
+    """
+    if backend == "journal":
+        return JournaledCsvStore(savefile, delimiter)
+    if backend == "sqlite":
+        return SQLiteStore(val.show_database_file, savefile, delimiter)
+    return CsvStore(savefile, delimiter)
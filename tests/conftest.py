@@ -0,0 +1,43 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import default_values as val
+from classes import ShowsFileHandler
+
+
+class ShowSettings:
+    """
+    The settings used by ShowsFileHandler in tests. Stands in for classes.Settings, which requires the GUI.
+    """
+    release_grace_period = val.release_grace_period
+    send_notifications = False
+    weight_to_add = val.weight_to_add
+    move_recently_released_to_top = val.move_recently_released_to_top
+    sort_by_upcoming = val.sort_by_upcoming
+
+
+@pytest.fixture(autouse=True)
+def in_temporary_directory(tmp_path, monkeypatch):
+    """
+    Runs every test in a directory of its own, as the shows are saved relative to the working directory.
+    """
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def new_shows(monkeypatch):
+    """
+    Returns a function which creates a ShowsFileHandler without any shows, which saves in the foreground and doesn't
+    use a binary snapshot.
+    """
+    monkeypatch.setattr(val, "use_show_snapshot", False)
+    monkeypatch.setattr(val, "save_in_background", False)
+
+    def make(release_grace_period=val.release_grace_period, clock=None) -> ShowsFileHandler:
+        settings = ShowSettings()
+        settings.release_grace_period = release_grace_period
+        return ShowsFileHandler(settings, clock=clock)
+    return make
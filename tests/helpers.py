@@ -0,0 +1,32 @@
+import random
+
+weekdays = ("mon", "tue", "wed", "thu", "fri", "sat", "sun", "today")
+
+
+def random_release_string(rng: random.Random, empty_share: float = 0.0, month_ends: bool = False) -> str:
+    """
+    Returns a random release string of any of the kinds of releases.
+
+    :param rng: The random number generator to draw from, so that a test sees the same strings on every run.
+    :param empty_share: The share of the strings that are empty, meaning shows without a release.
+    :param month_ends: Whether the strings may name a day after the 28th, which some months don't have. The hours
+    since such a release can't always be worked out.
+    """
+    if rng.random() < empty_share:
+        return ""
+    kind = rng.random()
+    time_of_day = f"{rng.randrange(24)}:{rng.choice([0, 30, 59, rng.randrange(60)]):02d}"
+    if kind < 0.45:
+        return f"{rng.choice(weekdays)} {time_of_day}"
+    day = rng.choice([1, 15, 28, 29, 30, 31, rng.randrange(1, 32)]) if month_ends else rng.randrange(1, 29)
+    if kind < 0.6:
+        return f".{day} {time_of_day}"
+    month = rng.randrange(1, 13)
+    if kind < 0.7:
+        return f".{day} /{month} {time_of_day}"
+    if kind < 0.8:
+        return f"/{month} .{day} {time_of_day}"
+    year = rng.choice([2025, 2026, 2027])
+    if kind < 0.9:
+        return f".{day} /{month} <{year} {time_of_day}"
+    return f"<{year} /{month} .{day} {time_of_day}"
@@ -0,0 +1,47 @@
+from classes import Show
+
+
+def make_archived(new_shows):
+    """
+    Returns a ShowsFileHandler holding a single show, which has been saved to the archive.
+    """
+    shows = new_shows()
+    shows.append(Show(num_id=5, title="Ended"))
+    shows.from_id(5).ended = True
+    shows.save()
+    return shows
+
+
+def archived_ids_after_reopening(shows, new_shows) -> list[int]:
+    """
+    Saves and closes shows, then returns the ids of the archived shows as they are read anew.
+    """
+    shows.save()
+    shows.close()
+    return [show.id for show in new_shows().get_archive()]
+
+
+def test_show_removed_then_added_back_stays_archived(new_shows):
+    shows = make_archived(new_shows)
+    show = shows.get_archive()[0]
+    shows.archive.remove(show)
+    shows.archive.add(show)
+    assert archived_ids_after_reopening(shows, new_shows) == [5]
+
+
+def test_show_added_removed_and_added_again_stays_archived(new_shows):
+    shows = new_shows()
+    show = Show(num_id=5, title="Ended")
+    shows.archive.add(show)
+    shows.archive.remove(show)
+    shows.archive.add(show)
+    assert archived_ids_after_reopening(shows, new_shows) == [5]
+
+
+def test_show_added_then_removed_is_not_archived(new_shows):
+    shows = make_archived(new_shows)
+    show = shows.get_archive()[0]
+    shows.archive.remove(show)
+    shows.archive.add(show)
+    shows.archive.remove(show)
+    assert archived_ids_after_reopening(shows, new_shows) == []
@@ -0,0 +1,57 @@
+import json
+import pytest
+from classes import Show, link_seperator
+
+
+def without_id(show: Show) -> tuple:
+    """
+    Returns everything import_shows keeps of a show, as the imported shows are given new ids.
+    """
+    return (show.title, show.ep, show.season, show.links, show.weight, show.color, show.ep_season_relevant,
+            show.get_release_string(), show.last_dismissal, show.is_hidden, show.ended)
+
+
+@pytest.mark.parametrize("file_name", ["shows.csv", "shows.jsonl"])
+def test_exported_shows_are_imported_unchanged(new_shows, tmp_path, monkeypatch, file_name):
+    shows = new_shows()
+    shows.append(Show(num_id=0, title="Plain"))
+    shows.append(Show(num_id=1, title='Comma, "quote" and ünïcode', ep=12, season=3,
+                      link_string=link_seperator.join(["https://a.example/1", "https://b.example/?q=1,2"]), weight=2,
+                      color=4, ep_season_relevant=False, release_string="fri 20:30", last_dismissal=1767225600.5,
+                      is_hidden=True))
+    shows.append(Show(num_id=2, title="Monthly", release_string=".15 /6 <2027 8:05"))
+    shows.append(Show(num_id=3, title="Ended", ep=40, release_string="sun 21:00"))
+    shows.from_id(3).ended = True
+    shows.save()
+    assert [show.title for show in shows.get_archive()] == ["Ended"]
+    expected = sorted(without_id(show) for show in shows.all_shows())
+    path = str(tmp_path / file_name)
+    assert shows.export_shows(path) == 4
+    shows.close()
+
+    import_directory = tmp_path / "import"  # Somewhere without the saved shows
+    import_directory.mkdir()
+    monkeypatch.chdir(import_directory)
+    imported = new_shows()
+    report = imported.import_shows(path)
+    assert (report.imported, report.errors) == (4, [])
+    assert sorted(without_id(show) for show in imported.all_shows()) == expected
+    assert [show.title for show in imported.get_archive()] == ["Ended"]
+    assert len({show.id for show in imported.all_shows()}) == 4
+
+    imported.close()
+    reopened = new_shows()
+    assert sorted(without_id(show) for show in reopened.all_shows()) == expected
+    assert [show.title for show in reopened.get_archive()] == ["Ended"]
+
+
+def test_export_without_the_archive_leaves_out_ended_shows(new_shows, tmp_path):
+    shows = new_shows()
+    shows.append(Show(num_id=0, title="Running"))
+    shows.append(Show(num_id=1, title="Ended"))
+    shows.from_id(1).ended = True
+    shows.save()
+    path = str(tmp_path / "shows.jsonl")
+    assert shows.export_shows(path, include_archive=False) == 1
+    with open(path, encoding="utf-8") as file:
+        assert [json.loads(line)["title"] for line in file] == ["Running"]
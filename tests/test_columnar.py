@@ -0,0 +1,55 @@
+import pytest
+import default_values as val
+from classes import ColumnarShow, Show
+
+
+@pytest.fixture
+def columnar_shows(new_shows, monkeypatch):
+    """
+    Returns a function which creates a ShowsFileHandler that keeps its shows in the columnar store.
+    """
+    monkeypatch.setattr(val, "columnar_show_store", True)
+    return new_shows
+
+
+def test_appended_show_is_the_show_held(columnar_shows):
+    shows = columnar_shows()
+    show = Show(num_id=1, title="A", weight=3)
+    shows.append(show)
+    assert show in shows.shows
+    assert isinstance(show, ColumnarShow)
+    assert shows.count_where(weight=3) == 1
+
+    show.title = "B"
+    show.weight = 5
+    assert shows.from_id(1).title == "B"
+    assert shows.count_where(weight=5) == 1
+    assert shows.has_unsaved_changes()
+
+    shows.remove(show)
+    assert len(shows) == 0
+    assert len(shows.columns) == 0
+    assert (show.title, show.weight) == ("B", 5)  # The fields are moved back into the show
+
+
+def test_replaced_show_is_the_show_held(columnar_shows):
+    shows = columnar_shows()
+    shows.append(Show(num_id=1, title="A"))
+    show = Show(num_id=2, title="B", color=2)
+    shows[0] = show
+    assert shows.shows == [show]
+    assert shows.count_where(color=2) == 1
+    assert len(shows.columns) == 1
+
+
+def test_columnar_shows_are_saved(columnar_shows):
+    shows = columnar_shows()
+    for n in range(5):
+        shows.append(Show(num_id=n, title=f"Show {n}", weight=n))
+    shows.from_id(3).weight = 10
+    shows.save()
+    shows.close()
+
+    reopened = columnar_shows()
+    assert sorted(show.weight for show in reopened) == [0, 1, 2, 4, 10]
+    assert reopened.count_where(weight=10) == 1
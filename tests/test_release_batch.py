@@ -0,0 +1,73 @@
+import datetime
+import random
+from classes import ReleaseInfo, release_hours_batch, hours_since_weekly, hours_till_weekly, hours_since_not_weekly, \
+    hours_till_not_weekly
+
+
+def scalar_hours(now: datetime.datetime, fields: tuple) -> tuple:
+    """
+    Returns the hours since and till release worked out by the scalar functions, or the type of the exception raised.
+    """
+    info = ReleaseInfo.from_fields("", fields)
+    if info.type == ReleaseInfo.TYPE_DATE:
+        date = (info.day, info.month, info.year)
+        since = lambda: hours_since_not_weekly(date, info.hour, info.minute, now)
+        till = lambda: hours_till_not_weekly(date, info.hour, info.minute, now)
+    elif info.type == ReleaseInfo.TYPE_WEEKDAY:
+        since = lambda: hours_since_weekly(info.weekday, info.hour, info.minute, now)
+        till = lambda: hours_till_weekly(info.weekday, info.hour, info.minute, now)
+    else:
+        since, till = lambda: 0, lambda: None
+    results = []
+    for function in (since, till):
+        try:
+            results.append(function())
+        except Exception as exception:
+            results.append(type(exception))
+    return tuple(results)
+
+
+def batch_hours(now: datetime.datetime, fields: tuple) -> tuple:
+    """
+    Returns the hours since and till release worked out by release_hours_batch, or the type of the exception raised.
+    """
+    try:
+        since, till = release_hours_batch(now, [fields])
+    except Exception as exception:
+        return type(exception), None
+    return since[0], till[0]
+
+
+def random_fields(rng: random.Random, now: datetime.datetime) -> tuple:
+    """
+    Returns the fields of a random release info, many of which are close to now or don't make a valid date.
+    """
+    release_type = rng.choice([0, 1, 2, 2])
+    fields = (release_type, rng.randint(0, 7), rng.choice([0, 1, 15, 28, 29, 30, 31, now.day, 40]),
+              rng.choice([0, 0, 1, 2, now.month, 12]), rng.choice([0, 0, now.year, now.year + 1, now.year - 1]),
+              rng.choice([0, now.hour, 23]), rng.choice([0, now.minute, 59]))
+    if release_type == 2 and fields[2] == 0:
+        fields = (2, 0, 1) + fields[3:]
+    if release_type == 2 and fields[4] and not fields[3]:
+        fields = fields[:3] + (1,) + fields[4:]
+    return fields
+
+
+def test_release_hours_batch_matches_the_scalar_functions():
+    rng = random.Random(1)
+    for _ in range(3000):
+        now = datetime.datetime(rng.choice([2023, 2024, 2025]), rng.randint(1, 12), rng.randint(1, 28),
+                                rng.randint(0, 23), rng.randint(0, 59), rng.choice([0, rng.randint(0, 59)]),
+                                rng.choice([0, rng.randint(1, 999999)]))
+        if rng.random() < 0.3:
+            try:
+                now = now.replace(day=rng.choice([29, 30, 31]))
+            except ValueError:
+                pass
+        for _ in range(30):
+            fields = random_fields(rng, now)
+            expected = scalar_hours(now, fields)
+            if isinstance(expected[0], type):
+                assert batch_hours(now, fields)[0] is expected[0], (now, fields)
+            else:
+                assert batch_hours(now, fields) == expected, (now, fields)
@@ -0,0 +1,33 @@
+import datetime
+import random
+import pytest
+from classes import Clock, ReleaseInfo, Show
+from helpers import random_release_string
+
+
+@pytest.mark.parametrize("grace_period", [0, 6, 36])
+def test_scheduled_release_status_matches_check_release(new_shows, grace_period):
+    rng = random.Random(3)
+    clock = Clock(datetime.datetime(2026, 3, 1))
+    shows = new_shows(grace_period, clock)
+    for n in range(300):
+        shows.append(Show(num_id=n, title=f"Show {n}", release_string=random_release_string(rng)))
+    shows.check_all_releases(allow_notifications=False)
+
+    for _ in range(1500):
+        clock.advance(rng.choice([1 / 3600, 1 / 60, 0.5, 3, 5]) * rng.random() * 2)
+        now = clock.now()
+        if rng.random() < 0.05:  # Edits are rescheduled right away
+            show = rng.choice(shows.shows)
+            edit = rng.random()
+            if edit < 0.4:
+                show.last_dismissal = now.timestamp()
+            elif edit < 0.7:
+                show.release_info = ReleaseInfo(random_release_string(rng))
+            else:
+                show.last_dismissal = 0
+        shows.update_releases(allow_notifications=False, now=now)
+        for show in shows:
+            status = show.is_recently_released
+            assert show.check_release(grace_period, now) == status, (show.get_release_string(), now)
+            show.is_recently_released = status
@@ -0,0 +1,43 @@
+import csv
+import default_values as val
+from classes import ReleaseInfo, Show
+
+
+def write_save_file(rows: list[list[str]]):
+    """
+    Writes rows to the save file, the way it is laid out on disk.
+    """
+    with open(val.show_file, "w", newline="", encoding="utf-8") as file:
+        csv.writer(file, delimiter=val.csv_delimiter, quotechar="|").writerows(rows)
+
+
+def test_time_past_the_end_of_the_day_is_carried_over():
+    release_info = ReleaseInfo("mon 24:30")
+    assert release_info.get_fields()[:2] == (ReleaseInfo.TYPE_WEEKDAY, 1)
+    assert (release_info.hour, release_info.minute) == (0, 30)
+    assert release_info.release_string == "mon 24:30"
+
+
+def test_unparsable_release_string_is_kept():
+    release_info = ReleaseInfo(".5 /3 24:00")
+    assert not release_info.is_defined()
+    assert release_info.release_string == ".5 /3 24:00"
+
+
+def test_release_strings_of_older_pickers_survive_loading_and_saving(new_shows):
+    write_save_file([["0", "Old", "1", "1", "", "0", "0", "False", "mon 24:30", "0.0", "False", "False"],
+                     ["1", "Older", "1", "1", "", "0", "0", "False", ".5 /3 <2026 60:60", "0.0", "False", "False"]])
+    shows = new_shows()
+    assert shows.from_id(0).release_info.is_defined()
+    for show in shows:
+        show.title += "!"  # So that every show is written anew
+    shows.save()
+    shows.close()
+
+    reopened = new_shows()
+    assert [show.get_release_string() for show in sorted(reopened, key=lambda show: show.id)] == \
+           ["mon 24:30", ".5 /3 <2026 60:60"]
+    for row in [show.as_row() for show in reopened]:
+        show = Show.from_row(row)
+        show.hydrate()
+        assert show.as_row()[8] == row[8]
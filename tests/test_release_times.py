@@ -0,0 +1,38 @@
+import datetime
+import random
+from classes import ReleaseInfo
+from helpers import random_release_string
+
+
+def hours(since, till, now: datetime.datetime) -> tuple:
+    """
+    Returns the hours since and till release, where the hours since release are "error" if they can't be worked out.
+    """
+    try:
+        hours_since = since(now)
+    except ValueError:
+        hours_since = "error"
+    return hours_since, till(now)
+
+
+def test_cached_release_times_match_the_scalar_functions():
+    rng = random.Random(5)
+    for _ in range(1500):
+        info = ReleaseInfo(random_release_string(rng, month_ends=True))
+        if not info.is_defined():
+            continue
+        now = datetime.datetime(2026, 1, 1) + datetime.timedelta(seconds=rng.randrange(86400 * 365 * 2))
+        for _ in range(200):  # Mostly forwards in time, as the clock moves, but now and then backwards
+            now += datetime.timedelta(seconds=rng.choice([1, 7, 59, 60, 61, 3600, 86400, rng.randrange(86400 * 10)]),
+                                      microseconds=rng.choice([0, 0, 123]))
+            if rng.random() < 0.03:
+                now -= datetime.timedelta(days=rng.randrange(40))
+            if rng.random() < 0.2:  # Exactly at the minute of release
+                now = now.replace(hour=info.hour, minute=info.minute, second=rng.choice([0, 30]))
+            expected = hours(info._hours_since_release, info._hours_to_release, now)
+            cached = hours(info.hours_since_release, info.hours_to_release, now)
+            for expected_hours, cached_hours in zip(expected, cached):
+                if isinstance(expected_hours, float) and isinstance(cached_hours, float):
+                    assert abs(expected_hours - cached_hours) < 1e-9, (info.release_string, now)
+                else:
+                    assert expected_hours == cached_hours, (info.release_string, now)
@@ -0,0 +1,62 @@
+import datetime
+import random
+import pytest
+from classes import Clock, ReleaseInfo, Show
+from helpers import random_release_string
+
+titles = ("A", "b", "C", "dx", "Dx", "e", "a")
+
+
+def sorting_key(show: Show, weight_to_add: int, sort_by_upcoming: bool, now: datetime.datetime) -> tuple:
+    """
+    Returns the key do_sorting sorted with before ShowOrder, which works out every key from scratch.
+    """
+    weight = -show.weight - weight_to_add if show.is_recently_released else -show.weight
+    title = show.title.casefold(), show.title
+    if not sort_by_upcoming:
+        return weight, title
+    if show.was_dismissed(now):
+        secondary = show.hours_to_release(now)
+    else:
+        secondary = -show.hours_since_last_dismissal(now)
+    if show.is_recently_released:
+        return weight, 0, secondary if secondary != 0.0 else 99999999, title
+    return weight, 1 if secondary > 0 else 2, secondary, title
+
+
+@pytest.mark.parametrize("weight_to_add, sort_by_upcoming", [(0, True), (3, True), (2, False)])
+def test_show_order_matches_sorting_every_show(new_shows, weight_to_add, sort_by_upcoming):
+    rng = random.Random(4)
+    clock = Clock(datetime.datetime(2026, 3, 1))
+    shows = new_shows(rng.choice([0, 6, 36]), clock)
+    for n in range(200):
+        # Dismissals are at least a second old when sorted. Within the first second, the key above ranks -0.0 hours
+        # since dismissal as if the show hadn't been dismissed, which ShowOrder doesn't copy
+        last_dismissal = clock.now().timestamp() - rng.randrange(1, 400 * 3600) if rng.random() < 0.5 else 0
+        shows.append(Show(num_id=n, title=rng.choice(titles) + str(n % 7), weight=rng.randrange(3),
+                          release_string=random_release_string(rng, empty_share=0.1), last_dismissal=last_dismissal))
+    shows.check_all_releases(allow_notifications=False)
+
+    for _ in range(1500):
+        clock.advance(rng.choice([1 / 3600, 1 / 60, 0.5, 3, 5]) * rng.random() * 2)
+        now = clock.now()
+        if rng.random() < 0.05:
+            show = rng.choice(shows.shows)
+            edit = rng.random()
+            if edit < 0.3:
+                show.last_dismissal = now.timestamp() - 1
+            elif edit < 0.5:
+                show.release_info = ReleaseInfo(random_release_string(rng, empty_share=0.1))
+            elif edit < 0.7:
+                show.weight = rng.randrange(3)
+            elif edit < 0.8:
+                show.title = rng.choice(["A", "Z", "m", "a", "b2", "B2"])
+            elif edit < 0.9:
+                shows.remove(show)
+            else:
+                shows.append(Show(num_id=shows.new_id(), title="new",
+                                  release_string=random_release_string(rng, empty_share=0.1)))
+        shows.update_releases(allow_notifications=False, now=now)
+        shows.do_sorting(weight_to_add, sort_by_upcoming, now)
+        keys = [sorting_key(show, weight_to_add, sort_by_upcoming, now) for show in shows]
+        assert keys == sorted(keys), now
@@ -0,0 +1,53 @@
+from classes import Show, ShowsFileHandler
+
+
+def make_shows(new_shows, num_of_shows: int) -> ShowsFileHandler:
+    """
+    Returns a ShowsFileHandler holding num_of_shows shows, which have been saved.
+    """
+    shows = new_shows()
+    for n in range(num_of_shows):
+        shows.append(Show(num_id=n, title=f"Show {n}", weight=n % 10, color=n % 4))
+    shows.save()
+    return shows
+
+
+def test_restore_backup_removes_restored_shows_from_the_archive(new_shows):
+    shows = make_shows(new_shows, 10)
+    generation = shows.backups.backup()
+    shows.from_id(4).ended = True
+    shows.save()
+    assert [show.id for show in shows.get_archive()] == [4]
+
+    shows.restore_backup(generation)
+    assert 4 in (show.id for show in shows)
+    assert shows.get_archive() == []
+
+
+def test_from_id_finds_the_restored_shows(new_shows):
+    shows = make_shows(new_shows, 10)
+    generation = shows.backups.backup()
+    shows.remove(shows.from_id(4))
+    shows.from_id(5).title = "Changed"
+    shows.save()
+
+    shows.restore_backup(generation)
+    for show_id in range(10):
+        show = shows.from_id(show_id)
+        assert show in shows.shows
+        assert show.tracker is shows
+    assert shows.from_id(5).title == "Show 5"
+
+
+def test_delete_archived_is_saved(new_shows):
+    shows = make_shows(new_shows, 10)
+    shows.from_id(4).ended = True
+    shows.save()
+    shows.delete_archived(shows.get_archive()[0])
+    assert shows.has_unsaved_changes()
+    shows.save()
+    shows.close()
+
+    reopened = new_shows()
+    assert reopened.get_archive() == []
+    assert 4 not in (show.id for show in reopened)
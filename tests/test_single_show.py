@@ -0,0 +1,64 @@
+import os
+import pytest
+from classes import change_episode_by_id, read_show
+from storage import CsvStore, JournaledCsvStore, MappedShowsReader, RowChanges, SQLiteStore, COL_EP
+
+
+def make_row(show_id: int, title: str, ep: int) -> list[str]:
+    """
+    Returns the row of a show, laid out like the save file.
+    """
+    return [str(show_id), title, str(ep), "1", "", "0", "0", "True", "", "0.0", "False", "False"]
+
+
+rows = [make_row(0, "First", 3), make_row(1, "Second", 9), make_row(2, "Third", 12)]
+
+
+def test_offset_index_is_rebuilt_when_the_save_file_changes():
+    store = CsvStore("saved.csv", ",")
+    store.write_rows(rows)
+    assert MappedShowsReader("saved.csv", ",").read_row(1) == rows[1]
+    assert os.path.isfile("saved.csv.idx")
+
+    changed = [make_row(1, "A much longer title than before", 4), make_row(3, "Fourth", 1)]
+    store.write_rows(changed)
+    reader = MappedShowsReader("saved.csv", ",")
+    assert reader.read_row(1) == changed[0]
+    assert reader.read_row(3) == changed[1]
+    assert reader.read_row(0) is None
+
+
+def test_read_show():
+    store = CsvStore("saved.csv", ",")
+    store.write_rows(rows)
+    assert read_show(2, store).title == "Third"
+    assert read_show(5, store) is None
+
+
+def test_episode_of_the_same_width_is_changed_in_place():
+    store = CsvStore("saved.csv", ",")
+    store.write_rows(rows)
+    inode = os.stat("saved.csv").st_ino
+    assert change_episode_by_id(0, store=store)
+    assert os.stat("saved.csv").st_ino == inode  # Not replaced by a new file
+    assert sorted(store.read_rows()) == [make_row(0, "First", 4), rows[1], rows[2]]
+
+
+@pytest.mark.parametrize("store_class", [CsvStore, JournaledCsvStore])
+def test_wider_episode_is_saved_like_any_other_change(store_class):
+    store = store_class("saved.csv", ",")
+    CsvStore("saved.csv", ",").write_rows(rows)
+    assert change_episode_by_id(1, store=store)
+    assert store.read_row(1) == make_row(1, "Second", 10)
+    assert sorted(store.read_rows()) == [rows[0], make_row(1, "Second", 10), rows[2]]
+    assert not change_episode_by_id(5, store=store)
+
+
+def test_episode_is_changed_in_the_database():
+    store = SQLiteStore("shows.db", "saved.csv", ",")
+    changes = RowChanges()
+    changes.added = rows
+    store.save([], changes)
+    assert change_episode_by_id(2, by=-2, store=store)
+    assert store.read_row(2)[COL_EP] == "10"
+    store.close()
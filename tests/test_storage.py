@@ -0,0 +1,159 @@
+import os
+import pytest
+from storage import (BackupManager, CsvStore, JournaledCsvStore, RowChanges, SQLiteStore, apply_journal_records,
+                     clone_file, COL_EP, COL_IS_HIDDEN, COL_TITLE, JOURNAL_ADD, JOURNAL_DELETE, JOURNAL_SET)
+
+
+def test_clone_file_never_writes_through_a_hard_link():
+    with open("live.csv", "wb") as file:
+        file.write(b"live data")
+    clone_file("live.csv", "copy.csv", allow_link=True)
+    with open("other.csv", "wb") as file:
+        file.write(b"other")
+    clone_file("other.csv", "copy.csv", allow_link=False)
+    with open("live.csv", "rb") as file:
+        assert file.read() == b"live data"
+    with open("copy.csv", "rb") as file:
+        assert file.read() == b"other"
+
+
+def test_backups_within_the_same_second_keep_the_save_file():
+    store = CsvStore("saved.csv", ",")
+    store.write_rows([["0", "Show", "1", "1", "", "0", "0", "False", "", "0.0", "False", "False"]])
+    size = os.path.getsize("saved.csv")
+    backups = BackupManager(store, "backups", interval=0, num_of_generations=10, keep_uncompressed=10)
+    generations = [backups.backup() for _ in range(3)]
+    assert os.path.getsize("saved.csv") == size
+    assert len(set(generations)) == 3
+    assert backups.generations() == generations[::-1]
+    assert all(len(backups.read_generation(generation)) == 1 for generation in generations)
+
+
+def make_row(show_id: int, title: str, hidden: bool = False) -> list[str]:
+    """
+    Returns the row of a show, laid out like the save file.
+    """
+    return [str(show_id), title, "1", "2", "https://example.com", "3", "1", "True", "mon 20:00", "0.0", str(hidden),
+            "False"]
+
+
+def test_sqlite_store_round_trip():
+    store = SQLiteStore("shows.db", "saved.csv", ",")
+    changes = RowChanges()
+    changes.added = [make_row(0, "First"), make_row(1, "Second", hidden=True), make_row(2, "Third")]
+    store.save([], changes)
+    changes = RowChanges()
+    changes.updated = [("0", COL_TITLE, "Renamed"), ("1", COL_IS_HIDDEN, "False")]
+    changes.removed = ["2"]
+    store.save([], changes)
+    store.close()
+
+    reopened = SQLiteStore("shows.db", "saved.csv", ",")
+    expected = [make_row(0, "Renamed"), make_row(1, "Second")]
+    assert sorted(reopened.read_rows()) == expected
+    assert reopened.read_row(1) == expected[1]
+    assert reopened.read_row(2) is None
+    reopened.close()
+
+
+def test_sqlite_store_migrates_the_csv_save_file():
+    rows = [make_row(0, "First"), make_row(1, "Second", hidden=True)]
+    CsvStore("saved.csv", ",").write_rows(rows)
+    store = SQLiteStore("shows.db", "saved.csv", ",")
+    assert sorted(store.read_rows()) == rows
+    store.close()
+
+
+def test_failed_sqlite_migration_is_tried_again(monkeypatch):
+    rows = [make_row(0, "First"), make_row(1, "Second")]
+    CsvStore("saved.csv", ",").write_rows(rows)
+
+    def fail(self, row):
+        raise ValueError("Malformed row")
+    with monkeypatch.context() as patch:
+        patch.setattr(SQLiteStore, "to_database", fail)
+        with pytest.raises(ValueError):
+            SQLiteStore("shows.db", "saved.csv", ",")
+    assert not os.path.exists("shows.db")
+
+    store = SQLiteStore("shows.db", "saved.csv", ",")
+    assert sorted(store.read_rows()) == rows
+    store.close()
+
+
+def test_journal_records_are_applied_in_order_and_can_be_replayed():
+    records = [[JOURNAL_ADD, *make_row(0, "First")], [JOURNAL_ADD, *make_row(1, "Second")],
+               [JOURNAL_SET, "0", str(COL_TITLE), "Renamed"], [JOURNAL_SET, "0", "14", "past the end"],
+               [JOURNAL_DELETE, "1"], [JOURNAL_ADD, *make_row(1, "Second again")], [JOURNAL_SET, "9", "1", "missing"],
+               [JOURNAL_DELETE, "9"]]
+    expected = {"0": make_row(0, "Renamed") + ["", "", "past the end"], "1": make_row(1, "Second again")}
+    rows = apply_journal_records({}, records)
+    assert rows == expected
+    assert apply_journal_records(rows, records) == expected
+
+
+def test_damaged_journal_records_are_skipped():
+    records = [[JOURNAL_SET, "0", "not a column", "x"], [JOURNAL_SET, "0"], [JOURNAL_DELETE], ["Z", "0"],
+               [JOURNAL_SET, "0", str(COL_EP), "7"]]
+    assert apply_journal_records({"0": make_row(0, "Show")}, records)["0"][COL_EP] == "7"
+
+
+def saved_in_journal(store: JournaledCsvStore) -> list[list[str]]:
+    """
+    Saves some shows to the journal of store, one change at a time, and returns the rows as they should be read.
+    """
+    rows = [make_row(0, "First"), make_row(1, "Second"), make_row(2, "Third, with | and \\")]
+    for row in rows:
+        changes = RowChanges()
+        changes.added.append(row)
+        store.save([], changes)
+    changes = RowChanges()
+    changes.updated.append(("0", COL_EP, "12"))
+    changes.removed.append("1")
+    store.save([], changes)
+    rows[0][COL_EP] = "12"
+    return [rows[0], rows[2]]
+
+
+def test_journal_is_replayed_on_top_of_the_snapshot():
+    store = JournaledCsvStore("saved.csv", ",", compaction_size=10 ** 9)
+    store.write_rows([make_row(5, "In the snapshot")])
+    expected = [make_row(5, "In the snapshot")] + saved_in_journal(store)
+    assert os.path.getsize("saved.csv.journal") > 0
+    assert JournaledCsvStore("saved.csv", ",").read_rows() == expected
+
+
+def test_half_written_journal_record_is_ignored():
+    store = JournaledCsvStore("saved.csv", ",", compaction_size=10 ** 9)
+    expected = saved_in_journal(store)
+    with open("saved.csv.journal", "a", newline="", encoding="utf-8") as journal:
+        journal.write(f"{JOURNAL_SET},0,{COL_TITLE},Half writ")
+    assert JournaledCsvStore("saved.csv", ",").read_rows() == expected
+
+
+def test_compaction_folds_the_journal_into_the_snapshot():
+    store = JournaledCsvStore("saved.csv", ",", compaction_size=10 ** 9)
+    expected = saved_in_journal(store)
+    store.compaction_size = os.path.getsize("saved.csv.journal")  # The next save grows the journal beyond this
+    changes = RowChanges()
+    changes.updated.append(("2", COL_TITLE, "Third"))
+    store.save([], changes)
+    expected[1][COL_TITLE] = "Third"
+    store.wait_for_compaction()
+    assert not os.path.exists("saved.csv.journal")
+    assert not os.path.exists("saved.csv.journal.compacting")
+    assert CsvStore("saved.csv", ",").read_rows() == expected
+    assert JournaledCsvStore("saved.csv", ",").read_rows() == expected
+
+
+def test_interrupted_compaction_is_finished_on_reading():
+    store = JournaledCsvStore("saved.csv", ",", compaction_size=10 ** 9)
+    expected = saved_in_journal(store)
+    os.replace("saved.csv.journal", "saved.csv.journal.compacting")  # As if the app stopped while compacting
+    changes = RowChanges()
+    changes.updated.append(("2", COL_IS_HIDDEN, "True"))
+    store.save([], changes)
+    expected[1][COL_IS_HIDDEN] = "True"
+    assert JournaledCsvStore("saved.csv", ",").read_rows() == expected
+    assert not os.path.exists("saved.csv.journal.compacting")
+    assert JournaledCsvStore("saved.csv", ",").read_rows() == expected
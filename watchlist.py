@@ -1,11 +1,12 @@
 import random
 from classes import *
 import guide_strings
-from default_values import delay_to_save_shows, update_release_vals_interval, recently_released_string
+from default_values import delay_to_save_shows, update_release_vals_interval, recently_released_string, \
+    initial_row_pool_size, scroll_step
 
 # noinspection PyPep8Naming
 import PySimpleGUI as sg
-from typing import List, Union
+from typing import List, Union, Any
 import mouse
 import time
 
@@ -188,8 +189,6 @@ def show_editor(title: str = "Show Editor", show: Show = None, show_purge: bool
         sg.popup_error(title="Couldn't convert to integer")
         return False
 
-    do_release_update = False
-
     show.title = data["show_title"]
     show.ep = data["show_ep"]
     show.season = data["show_season"]
@@ -197,15 +196,14 @@ def show_editor(title: str = "Show Editor", show: Show = None, show_purge: bool
     show.is_hidden = data["show_is_hidden"]
     show.ep_season_relevant = data["show_ep_season_relevant"]
     show.color = show_color
+    # Changes to the release info, dismissal or ended flag have the show checked again. See ReleaseScheduler
     if show.ended != data["ended_checkbox"]:
         show.ended = data["ended_checkbox"]
-        do_release_update = True
 
     if purge_weight is False:
         if show.release_info != release_info or show.last_dismissal != last_dismissal:
             show.last_dismissal = last_dismissal
             show.release_info = release_info
-            do_release_update = True
         show.weight = data["show_weight"]
     else:
         show.ended = True
@@ -214,8 +212,6 @@ def show_editor(title: str = "Show Editor", show: Show = None, show_purge: bool
         if settings.purge_color_index >= 0:
             show.color = settings.purge_color_index
 
-    if do_release_update:
-        shows.check_all_releases(allow_notifications=False)
     return show
 
 
@@ -319,7 +315,7 @@ def get_date_wise_release_string(initial_release_string: str = "") -> str:
         Returns the currently defined release info string.
         """
         if window["never"].get():
-            return f".{day} /{month} <{year} {min(60, hour)}:{min(60, minute)}"
+            return f".{day} /{month} <{year} {hour}:{minute}"
         if window["yearly"].get():
             return f".{day} /{month} {hour}:{minute}"
         if window["monthly"].get():
@@ -350,14 +346,14 @@ def get_date_wise_release_string(initial_release_string: str = "") -> str:
             set_upper_strings()
         elif event == "hour":
             try:
-                hour = int(values["hour"])
+                hour = min(23, max(0, int(values["hour"])))  # Release strings only allow times of day
             except ValueError:
                 hour = 0
             window["current"].update(value=get_current_string())
             set_upper_strings()
         elif event == "minute":
             try:
-                minute = int(values["minute"])
+                minute = min(59, max(0, int(values["minute"])))
             except ValueError:
                 minute = 0
             window["current"].update(value=get_current_string())
@@ -408,8 +404,7 @@ def get_release_info(initial_release_info: ReleaseInfo = ReleaseInfo()) -> Relea
         if not weekday_as_string and not hour and not minute:
             rel_win["release_string"].update(value="")
             return
-        rel_win["release_string"].update(value=f"{weekday_as_string} {min(60, hour)}:"
-                                               f"{0 if minute < 10 else ''}{min(60, minute)}")
+        rel_win["release_string"].update(value=f"{weekday_as_string} {hour}:{0 if minute < 10 else ''}{minute}")
 
     while True:
         event, values, = rel_win.read()
@@ -424,13 +419,13 @@ def get_release_info(initial_release_info: ReleaseInfo = ReleaseInfo()) -> Relea
             rel_win["release_string"].update(value=get_date_wise_release_string())
         elif event == "hour":
             try:
-                hour = int(values["hour"])
+                hour = min(23, max(0, int(values["hour"])))  # Release strings only allow times of day
             except ValueError:
                 hour = 0
             write_release_string()
         elif event == "minute":
             try:
-                minute = int(values["minute"])
+                minute = min(59, max(0, int(values["minute"])))
             except ValueError:
                 minute = 0
             write_release_string()
@@ -450,22 +445,11 @@ def get_existing_weights(shows_obj: ShowsFileHandler):
     """
     Returns a dict with the used weights as keys and the amount of shows using them as weights as their value.
     """
-    weight_dict = {}
-    for show in shows_obj:
-        if show.weight in weight_dict:
-            weight_dict[show.weight] += 1
-            continue
-        weight_dict[show.weight] = 1
-    return weight_dict
+    return dict(sorted(shows_obj.count_by("weight").items(), reverse=True))
 
 
 def change_weights(change_dict: dict[int, int]):
-    shows_changed = []
-    for weight in change_dict:
-        for show in shows:
-            if show.weight == weight and show.id not in shows_changed:
-                show.weight = change_dict[weight]
-                shows_changed.append(show.id)
+    shows.reweight(change_dict)
 
 
 def weight_control_panel():
@@ -559,6 +543,37 @@ def weight_control_panel():
             break
 
 
+def backup_window() -> bool:
+    """
+    Opens a window listing every generation of backups with the time it was taken and the number of shows in it.
+    One of them can then be restored.
+
+    :return: True if a backup was restored
+    """
+    generations = shows.backups.list_generations()
+    layout = [
+        [sg.T("Backups")],
+        [sg.Listbox([f"{taken:%Y-%m-%d %H:%M:%S}  -  {count} shows" for _, taken, count in generations],
+                    key="LIST", size=(40, 10))],
+        [sg.Button("Restore"), sg.Button("Cancel")]
+    ]
+    window = sg.Window("Backups", layout=layout, font=(settings.fonttype, settings.default_font_size))
+    while True:
+        event, values = window.read()
+        if event == sg.WIN_CLOSED or event == "Cancel":
+            window.close()
+            return False
+        elif event == "Restore":
+            if not values["LIST"]:
+                continue
+            if sg.popup_yes_no("All current shows will be replaced. Are you sure?") == "No":
+                continue
+            generation = generations[window["LIST"].get_indexes()[0]][0]
+            window.close()
+            shows.restore_backup(generation)
+            return True
+
+
 def guide():
     """
     Opens a non-interactive window showing some user guides.
@@ -798,22 +813,34 @@ class MainWin:
         self.release_elements = []
         self.column_elements = []
 
-        self.number_of_displayed_shows = len(shows) if settings.show_all else min(len(shows), settings.show_amount)
+        # The rows are a fixed pool of elements, which are reused for other shows as the list is scrolled. The pool is
+        # fitted to the height of the window once it has been measured. See fit_rows_to_window
+        self.row_pool_size = initial_row_pool_size
+        self.rows_fitted = False  # Whether the pool has been fitted to the window, which requires a row to measure
+        self.first_displayed_show = 0  # The visual index of the show in the first row
+        # Only a single row is made along with the window, as it is needed to measure the height of a row. The rest are
+        # made all at once when the shows are displayed. See extend_by_x_rows
+        self.number_of_displayed_shows = min(1, len(shows))
 
+        # The column isn't scrollable itself, as scrolling moves the shows through the rows instead. See scroll_to
         self.shows_col = sg.Col([[self.column_element(ind)] for ind in range(self.number_of_displayed_shows)],
-                                vertical_scroll_only=True,
-                                scrollable=True,
                                 expand_x=True,
                                 expand_y=True)
         self.shows_col_contents_changed = False
         self.number_of_invisible_rows = 0
         self.last_release_update = 0
+        self.displayed_till_release: list[str] = []  # The time till release displayed in every row
         self.last_show_change = 0
+        self.last_seen_shows_version = shows.version
+        self.scrollbar_state = None  # The (range, value) of the scrollbar, see update_scrollbar
+        # The properties last applied to the elements of every row, by key of element. Only the properties that differ
+        # from these are sent to Tk. See update_element
+        self.applied_properties: dict[str, dict[str, Any]] = {}
 
         topcol = [[butt(" + ", key="add_show", border_width=0, tooltip="Add a show to the list"),
                    butt(" ⛭ ", key="preferences", border_width=0, tooltip="Preferences"),
                    butt(" ⮝ " if settings.show_all else " ⮟ ", key="show_all", border_width=0,
-                        tooltip="Show less (faster)" if settings.show_all else "Show more (slower)"),
+                        tooltip="Show less" if settings.show_all else "Show more"),
                    butt(" 🔍 ", key="search_button", border_width=0, tooltip="Search"),
                    sg.Checkbox(" ", key="index_checkbox", text_color=settings.button_color,
                                tooltip="Enables or disables the showing of indices",
@@ -828,12 +855,17 @@ class MainWin:
                                tooltip="Enables or disables the showing of hidden shows",
                                default=settings.display_hidden, enable_events=True),
                    butt(" 📖 ", key="open_guide", border_width=0, tooltip="Open guide"),
-                   butt(" 🏋 ", key="open_weight_control_panel", border_width=0, tooltip="Open Weight Control Panel")]
+                   butt(" 🏋 ", key="open_weight_control_panel", border_width=0, tooltip="Open Weight Control Panel"),
+                   butt(" 🗄 ", key="open_backups", border_width=0, tooltip="Restore a backup")]
                   ]
 
+        self.top_col = sg.Col(topcol)
+        self.scrollbar = sg.Slider(range=(0, 0), default_value=0, orientation="v", key="scroll",
+                                   disable_number_display=True, enable_events=True, border_width=0, expand_y=True)
+
         layout = [
-            [sg.Col(topcol)],
-            [self.shows_col],
+            [self.top_col],
+            [self.shows_col, self.scrollbar],
         ]
 
         # noinspection PyTypeChecker
@@ -860,10 +892,12 @@ class MainWin:
                                                                settings.right_click_selected_background),
                              icon="GenIko.ico")
 
+        self.fit_rows_to_window()
+        shows.check_all_releases(allow_notifications=False)  # The grace period may have changed in the preferences
         self.sort_shows_and_display()
 
         for key in ("add_show", "preferences", "show_all", "search_button", "index_checkbox", "release_checkbox",
-                    "open_guide", "open_weight_control_panel"):
+                    "open_guide", "open_weight_control_panel", "open_backups"):
             self.win[key].block_focus()
             self.win[key].set_cursor("plus")
 
@@ -876,16 +910,16 @@ class MainWin:
         """
         while not self.shouldbreak:
             settings.initialwinpos = self.win.CurrentLocation()
-            settings.initialwinsize = self.win.Size
+            if settings.initialwinsize != self.win.Size or not self.rows_fitted:
+                settings.initialwinsize = self.win.Size
+                if self.fit_rows_to_window():
+                    self.display_shows()
             event, values = self.win.read(timeout=100)
 
-            # The methods called within the if-statement below are intended to update the scrollable area of the
-            # .show_col column. However, it seems that this might be a bit inconsistent - i won't look further into
-            # right now. BUT if there are problems, they probably stem from here.
+            # Lays out the window anew once rows have been made, hidden or unhidden
             if self.shows_col_contents_changed:
                 self.shows_col_contents_changed = False
                 self.win.visibility_changed()
-                self.shows_col.contents_changed()
 
             # if event != "__TIMEOUT__":
             #    print(event)
@@ -893,17 +927,29 @@ class MainWin:
             if event == sg.WIN_CLOSED or self.shouldbreak or event == "Close":
                 self.close()
                 break
-            elif event.startswith("Mouse"):  # Ignore MouseWheel:Up and MouseWheel:Down events
+            elif event == "MouseWheel:Up":
+                self.scroll_to(self.first_displayed_show - scroll_step)
+            elif event == "MouseWheel:Down":
+                self.scroll_to(self.first_displayed_show + scroll_step)
+            elif event.startswith("Mouse"):  # Ignore any other mouse events
                 pass                         # (end if early)
+            elif event == "scroll":
+                self.scroll_to(int(values["scroll"]))
             elif event == "__TIMEOUT__":
                 now = time.time()
+                if self.last_seen_shows_version != shows.version:  # Something worth saving has changed
+                    self.last_seen_shows_version = shows.version
+                    self.update_last_show_change()
                 if self.last_show_change != 0 and now - self.last_show_change > delay_to_save_shows:
                     shows.save()
                     self.last_show_change = 0
 
-                if self.last_release_update + update_release_vals_interval < now:
+                # Only the shows whose release status may have changed are checked. The display is still refreshed
+                # every now and then, as the time till release of every show changes.
+                changed = shows.update_releases()
+                if changed or self.last_release_update + update_release_vals_interval < now:
                     self.last_release_update = time.time()
-                    self.sort_shows_and_display()
+                    self.refresh_shows(changed)
 
                 continue
 
@@ -922,7 +968,7 @@ class MainWin:
                 show = self.get_show_from_visual_index(event.removeprefix("Eplus:"))
                 if show.ep_season_relevant:
                     show.ep = int(show.ep) + 1
-                    self.win[event](value=show.ep)
+                    self.update_element(event, value=show.ep)
                     self.update_last_show_change()
 
             elif event.startswith("Eminus:"):
@@ -930,7 +976,7 @@ class MainWin:
                 show = self.get_show_from_visual_index(show_index)
                 if show.ep_season_relevant:
                     show.ep = int(show.ep) - 1
-                    self.win[f"Eplus:{show_index}"](value=show.ep)
+                    self.update_element(f"Eplus:{show_index}", value=show.ep)
                     self.update_last_show_change()
 
             elif event.startswith("title:"):
@@ -944,7 +990,7 @@ class MainWin:
                 show = self.get_show_from_visual_index(event.removeprefix("Splus:"))
                 if show.ep_season_relevant:
                     show.season = str(int(show.season) + 1)
-                    self.win[event].update(value=show.season)
+                    self.update_element(event, value=show.season)
                     self.update_last_show_change()
 
             elif event.startswith("Sminus:"):
@@ -952,7 +998,7 @@ class MainWin:
                 show = self.get_show_from_visual_index(show_index)
                 if show.ep_season_relevant:
                     show.season = str(int(show.season) - 1)
-                    self.win[f"Splus:{show_index}"].update(value=show.season)
+                    self.update_element(f"Splus:{show_index}", value=show.season)
                     self.update_last_show_change()
 
             elif event.startswith("till_release:"):
@@ -962,7 +1008,7 @@ class MainWin:
             elif event == "index_checkbox":
                 settings.indices_visible = self.win["index_checkbox"].get()
                 for show_index in range(self.number_of_displayed_shows):
-                    self.win[f"index:{show_index}"].update(visible=settings.indices_visible)
+                    self.update_element(f"index:{show_index}", visible=settings.indices_visible)
 
             elif event == "release_checkbox":
                 settings.releases_visible = self.win["release_checkbox"].get()
@@ -993,6 +1039,10 @@ class MainWin:
             elif event == "open_weight_control_panel":
                 weight_control_panel()
 
+            elif event == "open_backups":
+                if backup_window():
+                    self.sort_shows_and_display()
+
             elif event == "preferences":
                 if update_preferences():
                     self.restart()
@@ -1008,15 +1058,14 @@ class MainWin:
                 show = show_editor()
                 if not show:
                     continue
-                show.id = shows.highest_id() + 1
+                show.id = shows.new_id()
                 shows.append(show)
                 self.sort_shows_and_display(allow_release_notifications=False)
 
             elif "::multi_links-" in event:
                 ref_show = self.get_show_from_suffix(event)
-                for show in shows:
-                    if ref_show.color == show.color:
-                        show.open_link()
+                for show in shows.shows_where(color=ref_show.color):
+                    show.open_link()
 
             elif "::auto_open_on_release-" in event:
                 show = self.get_show_from_suffix(event)
@@ -1034,9 +1083,7 @@ class MainWin:
                 clicked_show = self.get_show_from_suffix(event)
                 match_color = clicked_show.color
                 col_index = settings.text_colors.index(col)
-                for show in shows:
-                    if show.color == match_color and show.weight == clicked_show.weight:
-                        show.color = col_index
+                shows.recolor(col_index, color=match_color, weight=clicked_show.weight)
                 self.sort_shows_and_display()
 
             elif "::hide_show-" in event:
@@ -1057,20 +1104,19 @@ class MainWin:
 
             elif "::dismissal-" in event:
                 show = self.get_show_from_suffix(event)
-                show.last_dismissal = time.time()
+                show.last_dismissal = shows.clock.now().timestamp()
                 self.sort_shows_and_display()
 
             elif "::dismissal+ep+1-" in event:
                 show = self.get_show_from_suffix(event)
-                show.last_dismissal = time.time()
+                show.last_dismissal = shows.clock.now().timestamp()
                 if show.ep_season_relevant:
                     show.ep += 1
                 self.sort_shows_and_display()
 
             elif "::open_released-" in event:
-                for show in shows:
-                    if show.is_recently_released:
-                        show.open_link()
+                for show in shows.get_recently_released_shows():
+                    show.open_link()
 
             elif "::open_random-" in event:
                 random.choice(shows.get_recently_released_shows()).open_link()
@@ -1109,33 +1155,63 @@ class MainWin:
         """
         self.last_show_change = time.time()
 
-    @staticmethod
-    def get_show_from_visual_index(__index):
+    def get_show_from_visual_index(self, __index):
         """
-        Returns the corresponding show object to a visual index. (This means settings.display_hidden and hidden shows
-        are taken into account)
+        Returns the show displayed in a row, given the index of the row. (This means the scroll position,
+        settings.display_hidden and hidden shows are taken into account)
         """
+        __index = self.first_displayed_show + int(__index)
         if settings.display_hidden:
             return shows.from_index(__index)
         return shows.from_index_ignore_hidden(__index)
 
+    def get_visual_index(self, show: Show) -> int:
+        """
+        Returns the index of the row that displays a show. The opposite of get_show_from_visual_index. The index is
+        outside of the displayed rows if the show isn't displayed.
+        """
+        if settings.display_hidden:
+            return shows.get_index(show) - self.first_displayed_show
+        return shows.get_index_ignore_hidden(show) - self.first_displayed_show
+
     def sort_shows_and_display(self, allow_release_notifications=True):
         """
         Sorts and displays all shows. This method effectively updates the GUI.
+        The time is read once, so that everything is updated according to the same point in time.
+        """
+        now = shows.clock.now()
+        self.sort_shows(allow_release_notifications=allow_release_notifications, now=now)
+        self.display_shows(now=now)
+
+    def refresh_shows(self, releases_changed: bool):
+        """
+        Sorts and displays all shows as time passes. The shows are only redrawn if something that is displayed has
+        changed: the release status of a show, the order of the shows or the time till release of a displayed show.
+
+        :param releases_changed: True if the release status of a show has changed since the last refresh
         """
-        self.sort_shows(allow_release_notifications=allow_release_notifications)
-        self.display_shows()
+        now = shows.clock.now()
+        changed = self.sort_shows(allow_release_notifications=True, now=now) or releases_changed
+        if not changed and self.till_release_strings(now) == self.displayed_till_release:
+            return
+        self.display_shows(now=now)
 
     @staticmethod
-    def sort_shows(allow_release_notifications):
+    def sort_shows(allow_release_notifications, now=None) -> bool:
         """
         Sorts the shows and can send out notifications
+
+        :return: True if the release status of a show or the order of the shows has changed
         """
-        shows.check_all_releases(allow_notifications=allow_release_notifications)
-        shows.do_sorting(
+        if now is None:
+            now = shows.clock.now()
+        changed = shows.update_releases(allow_notifications=allow_release_notifications, now=now)
+        reordered = shows.do_sorting(
             weight_to_add=settings.weight_to_add if settings.move_recently_released_to_top else 0,
             sort_by_upcoming=settings.sort_by_upcoming,
+            now=now,
         )
+        return changed or reordered
 
     def extend_or_subtract_rows(self, to_display):
         """
@@ -1149,61 +1225,117 @@ class MainWin:
     def to_display_with_safety(self):
         """
         Returns the number of shows to display and ensures the correct number of visual rows.
+        The scroll position is kept within the shows, and no more rows than the pool holds are used.
         """
         to_display = self.num_of_shows_to_display()
-        self.extend_or_subtract_rows(to_display)
+        self.first_displayed_show = max(0, min(self.first_displayed_show, to_display - self.row_pool_size))
+        self.extend_or_subtract_rows(min(self.row_pool_size, to_display - self.first_displayed_show))
+        self.update_scrollbar(to_display)
         return to_display
 
+    def update_scrollbar(self, to_display):
+        """
+        Updates the range and position of the scrollbar, if they have changed.
+        """
+        state = (max(0, to_display - self.row_pool_size), self.first_displayed_show)
+        if state != self.scrollbar_state:
+            self.scrollbar_state = state
+            self.scrollbar.update(range=(0, state[0]), visible=state[0] > 0)
+            self.scrollbar.update(value=state[1])
+
+    def scroll_to(self, first_displayed_show):
+        """
+        Scrolls the list of shows, so that the show with the visual index first_displayed_show is in the first row.
+        The rows are then reused to display the shows that have come into view.
+        """
+        first_displayed_show = max(0, min(first_displayed_show, self.num_of_shows_to_display() - self.row_pool_size))
+        if first_displayed_show != self.first_displayed_show:
+            self.first_displayed_show = first_displayed_show
+            self.display_shows()
+
+    def fit_rows_to_window(self) -> bool:
+        """
+        Fits the pool of rows to the height of the window, according to the height of the first row. Rows are only made
+        or hidden the next time the shows are displayed.
+
+        :return: True if the size of the pool has changed
+        """
+        if not self.column_elements:
+            return False
+        row_height = self.column_elements[0].Widget.winfo_reqheight() + 2  # The padding above and below the row
+        available_height = self.win.Size[1] - self.top_col.Widget.winfo_reqheight()
+        row_pool_size = max(1, available_height // row_height)
+        changed = row_pool_size != self.row_pool_size
+        self.row_pool_size = row_pool_size
+        self.rows_fitted = True
+        return changed
+
+    def till_release_strings(self, now=None) -> list[str]:
+        """
+        Returns the time till release of every displayed show, as it is displayed.
+        """
+        if now is None:
+            now = shows.clock.now()
+        return [self.get_show_from_visual_index(ind).string_time_till_release(
+            precise_time_left=settings.remaining_time_prioritise_precision,
+            now=now,
+        ) for ind in range(self.number_of_displayed_shows)]
+
     def display_shows(self, do_title=False, do_till_release=False, do_ep_minus=False,
                       do_ep_plus=False, do_season_minus=False, do_season_plus=False, do_index=False,
-                      do_release=False, do_cursors=False, do_link=False, do_color_if_hidden=False):
+                      do_release=False, do_cursors=False, do_link=False, do_color_if_hidden=False, now=None):
         """
         Updates the values of elements of the GUI. If no elements are specified to be updated, all elements are updated.
+        The time till release is shown as of now, which is read from shows.clock if None.
         """
+        if now is None:
+            now = shows.clock.now()
         all_elements = not (do_title or do_till_release or do_ep_minus or do_ep_plus or do_season_minus or do_season_plus
                         or do_index or do_release or do_cursors or do_link or do_color_if_hidden)
 
         self.to_display_with_safety()
+        if all_elements or do_till_release:
+            self.displayed_till_release = self.till_release_strings(now)
 
         for ind in range(self.number_of_displayed_shows):
             show = self.get_show_from_visual_index(ind)
             color = settings.get_color(show.color)
 
             if all_elements or do_title:
-                self.win[f"title:{ind}"].update(value=limit_string_len(show.title, settings.max_title_display_len,
-                                                                       use_ellipsis=settings.shorten_with_ellpisis),
-                                                text_color=color)
+                self.update_element(f"title:{ind}", value=limit_string_len(show.title, settings.max_title_display_len,
+                                                                           use_ellipsis=settings.shorten_with_ellpisis),
+                                    text_color=color)
             if all_elements or do_till_release:
-                self.win[f"till_release:{ind}"].update(value=show.string_time_till_release(
-                    precise_time_left=settings.remaining_time_prioritise_precision,
-                ),
-                                                       text_color=color,
-                                                       visible=settings.show_till_release)
+                self.update_element(f"till_release:{ind}", value=self.displayed_till_release[ind],
+                                    text_color=color,
+                                    visible=settings.show_till_release)
             if all_elements or do_ep_minus:
-                self.win[f"Eminus:{ind}"].update(value="Ep:" if show.ep_season_relevant else "",
-                                                 text_color=color)
+                self.update_element(f"Eminus:{ind}", value="Ep:" if show.ep_season_relevant else "",
+                                    text_color=color)
             if all_elements or do_ep_plus:
-                self.win[f"Eplus:{ind}"].update(value=show.ep if show.ep_season_relevant else "",
-                                                text_color=color)
+                self.update_element(f"Eplus:{ind}", value=show.ep if show.ep_season_relevant else "",
+                                    text_color=color)
             if all_elements or do_season_minus:
-                self.win[f"Sminus:{ind}"].update(value="S:" if show.ep_season_relevant else "",
-                                                 text_color=color)
+                self.update_element(f"Sminus:{ind}", value="S:" if show.ep_season_relevant else "",
+                                    text_color=color)
             if all_elements or do_season_plus:
-                self.win[f"Splus:{ind}"].update(value=show.season if show.ep_season_relevant else "",
-                                                text_color=color)
+                self.update_element(f"Splus:{ind}", value=show.season if show.ep_season_relevant else "",
+                                    text_color=color)
             if all_elements or do_index:
-                self.win[f"index:{ind}"].update(text_color=color)
+                self.update_element(f"index:{ind}", value=str(self.first_displayed_show + ind + 1), text_color=color)
             if all_elements or do_release:
-                self.win[f"release:{ind}"].update(text_color=color,
-                                                  visible=settings.releases_visible and show.is_recently_released)
+                self.update_element(f"release:{ind}", text_color=color,
+                                    visible=settings.releases_visible and show.is_recently_released)
+            # The color of the link button is only set once, so that it isn't changed back and forth on screen
+            update_link = all_elements or do_link or not do_color_if_hidden or not show.auto_open_link_on_release
             if all_elements or do_color_if_hidden:
                 color = settings.hidden_button_color if show.is_hidden else settings.button_color
-                self.win[f"delete:{ind}"].update(button_color=(color, None))
-                self.win[f"link:{ind}"].update(button_color=(color, None))
-                self.win[f"properties:{ind}"].update(button_color=(color, None))
-            if ((all_elements or do_link)
-                    or (not (all_elements or do_color_if_hidden) or (not show.auto_open_link_on_release))):
-                self.win[f"link:{ind}"].update(button_color=(
+                self.update_element(f"delete:{ind}", button_color=(color, None))
+                if not update_link:
+                    self.update_element(f"link:{ind}", button_color=(color, None))
+                self.update_element(f"properties:{ind}", button_color=(color, None))
+            if update_link:
+                self.update_element(f"link:{ind}", button_color=(
                     settings.get_color(show.color) if show.auto_open_link_on_release
                     else
                     (settings.button_color if not show.is_hidden else settings.hidden_button_color),
@@ -1211,7 +1343,29 @@ class MainWin:
             if all_elements or do_cursors:
                 self.set_cursors(ind)
 
-        self.update_last_show_change()
+    def update_element(self, key: str, **properties):
+        """
+        Updates an element of a row, sending only the properties that differ from those last applied to it to Tk.
+        Every change to the elements of the rows must go through this method, or the applied properties are wrong.
+
+        :param key: The key of the element
+        :param properties: The properties to update, as given to the update method of the element
+        """
+        applied = self.applied_properties.setdefault(key, {})
+        changed = {name: value for name, value in properties.items()
+                   if name not in applied or applied[name] != value}
+        if changed:
+            self.win[key].update(**changed)
+            applied.update(changed)
+
+    def set_element_cursor(self, element: sg.Element, cursor: str):
+        """
+        Sets the cursor of an element of a row, unless it already is set. See update_element
+        """
+        applied = self.applied_properties.setdefault(element.key, {})
+        if applied.get("cursor") != cursor:
+            element.set_cursor(cursor)
+            applied["cursor"] = cursor
 
     def update_show_color(self, show: Show, new_color_id: int, show_index=None):
         """
@@ -1219,24 +1373,23 @@ class MainWin:
         """
         show.color = new_color_id
         if show_index is None:
-            show_index = shows.get_index(show)
+            show_index = self.get_visual_index(show)
+            if not 0 <= show_index < self.number_of_displayed_shows:  # The show has been scrolled out of view
+                self.update_last_show_change()
+                return
         color = settings.get_color(new_color_id)
-        self.win[f"index:{show_index}"].update(text_color=color)
-        self.win[f"title:{show_index}"].update(text_color=color)
-        self.win[f"till_release:{show_index}"].update(text_color=color)
-        self.win[f"Eminus:{show_index}"].update(text_color=color)
-        self.win[f"Eplus:{show_index}"].update(text_color=color)
-        self.win[f"Splus:{show_index}"].update(text_color=color)
-        self.win[f"Sminus:{show_index}"].update(text_color=color)
-        self.win[f"release:{show_index}"].update(text_color=color)
+        for name in ("index", "title", "till_release", "Eminus", "Eplus", "Splus", "Sminus", "release"):
+            self.update_element(f"{name}:{show_index}", text_color=color)
         self.update_last_show_change()
 
     def close(self):
         """
-        Closes the main window
+        Closes the main window. Any changes to shows are written to disk before returning.
         """
         self.shouldbreak = True
         self.win.close()
+        shows.save()
+        shows.flush()
 
     def restart(self):
         """
@@ -1290,7 +1443,7 @@ class MainWin:
                 found_indices = [-1] * results
                 found = [""] * results
                 search_query = v["search"].lower()
-                for show_index, s in enumerate(shows):
+                for show_index, s in enumerate(shows.all_shows()):  # Archived shows are found as well
                     if search_query in s.title.lower():
                         for ind, n in enumerate(found):
                             if n == "":
@@ -1305,7 +1458,10 @@ class MainWin:
                     for n in range(results):
                         if isinstance(found[n], Show):
                             search_win[f"s_title_{n}"].update(found[n].title)
-                            search_win[f"s_index_{n}"].update(f"{found_indices[n] + 1: >{index_len}}")
+                            if found[n].archived:
+                                search_win[f"s_index_{n}"].update(f"{'-': >{index_len}}")
+                            else:
+                                search_win[f"s_index_{n}"].update(f"{found_indices[n] + 1: >{index_len}}")
                             search_win[f"s_title_{n}"] \
                                 .update(text_color=settings.get_color(int(found[n].color)))
                             search_win[f"s_index_{n}"] \
@@ -1318,14 +1474,16 @@ class MainWin:
                 if not found[k] or sg.popup_yes_no("Are you sure?") == "No":
                     continue
 
-                delme = -1
-                for ind, n in enumerate(shows):
-                    if n.id == found[k].id:
-                        delme = ind
-                        break
+                if found[k].archived:
+                    shows.delete_archived(found[k])
+                    search_win.close()
+                    self.sort_shows_and_display()
+                    return
 
-                if delme != -1:
-                    shows.pop(delme)
+                try:
+                    shows.remove(shows.from_id(found[k].id))
+                except KeyError:
+                    pass
                 search_win.close()
                 self.sort_shows_and_display()
                 return
@@ -1512,16 +1670,16 @@ class MainWin:
         """
         Sets the proper cursors across one row of the GUI
         """
-        self.delete_elements[index].set_cursor("plus")
-        self.title_elements[index].set_cursor("plus")
+        self.set_element_cursor(self.delete_elements[index], "plus")
+        self.set_element_cursor(self.title_elements[index], "plus")
         relevant = self.get_show_from_visual_index(index).ep_season_relevant
 
-        self.ep_minus_elements[index].set_cursor("@down.cur" if relevant else "arrow")
-        self.ep_plus_elements[index].set_cursor("@up.cur" if relevant else "arrow")
-        self.season_minus_elements[index].set_cursor("@down.cur" if relevant else "arrow")
-        self.season_plus_elements[index].set_cursor("@up.cur" if relevant else "arrow")
-        self.properties_elements[index].set_cursor("plus")
-        self.link_elements[index].set_cursor("hand2")
+        self.set_element_cursor(self.ep_minus_elements[index], "@down.cur" if relevant else "arrow")
+        self.set_element_cursor(self.ep_plus_elements[index], "@up.cur" if relevant else "arrow")
+        self.set_element_cursor(self.season_minus_elements[index], "@down.cur" if relevant else "arrow")
+        self.set_element_cursor(self.season_plus_elements[index], "@up.cur" if relevant else "arrow")
+        self.set_element_cursor(self.properties_elements[index], "plus")
+        self.set_element_cursor(self.link_elements[index], "hand2")
 
     def shorten_by_x_rows(self, x):
         """
@@ -1543,30 +1701,28 @@ class MainWin:
         """
         Changes the visibility of a given row
         """
-        self.win[f"column:{index}"].update(visible=visibility)
+        self.update_element(f"column:{index}", visible=visibility)
         self.shows_col_contents_changed = True
 
     def extend_by_x_rows(self, x):
         """
-        Extends the usable rows in the GUI by x
-        """
-        for _ in range(x):
-            self.extend_by_one_row()
-
-    def extend_by_one_row(self):
-        """
-        Extends the number of usable rows in the GUI by one. If there are hidden rows, these are unhidden first.
+        Extends the usable rows in the GUI by x. If there are hidden rows, these are unhidden first. The rows that are
+        still missing are then made in a single call to extend_layout, so that the layout is only redone once.
         """
-        index = self.number_of_displayed_shows
-        if self.number_of_invisible_rows > 0:
-            self.change_visibility_of_row(index, True)
+        for _ in range(min(x, self.number_of_invisible_rows)):
+            self.change_visibility_of_row(self.number_of_displayed_shows, True)
             self.number_of_invisible_rows -= 1
-        else:
-            self.win.extend_layout(self.shows_col, [[self.column_element(index)]])
+            self.number_of_displayed_shows += 1
+            x -= 1
+
+        if x > 0:
+            first_index = self.number_of_displayed_shows
+            self.win.extend_layout(self.shows_col, [[self.column_element(index)]
+                                                    for index in range(first_index, first_index + x)])
+            self.number_of_displayed_shows += x
 
-        self.shows_col_contents_changed = True  # This causes self.shows_col.contents_changed() to be called
-        # immediately after self.win.read(). Why this needs to be the case, I cannot fathom. (BUT IT WORKS!)
-        self.number_of_displayed_shows += 1
+        self.shows_col_contents_changed = True  # This causes self.win.visibility_changed() to be called
+        # immediately after self.win.read()
 
 
 if __name__ == '__main__':
@@ -1584,4 +1740,5 @@ if __name__ == '__main__':
         MainWin(main_loop=True)
 
     settings.save()
-    shows.save()
\ No newline at end of file
+    shows.save()
+    shows.close()
\ No newline at end of file